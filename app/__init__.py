@@ -1,6 +1,7 @@
 """ Initial application specifications """
 
 from flask import Flask, redirect
+from flask_mail import Mail
 from flask_sqlalchemy import SQLAlchemy
 from instance.config import app_config
 from flasgger import Swagger
@@ -8,6 +9,7 @@ from flasgger import Swagger
 # pylint: disable=C0103
 
 db = SQLAlchemy()
+mail = Mail()
 
 def create_app(config_name):
     """ Function for creating application depending on configuration """
@@ -46,6 +48,19 @@ def create_app(config_name):
     Swagger(app)
 
     db.init_app(app)
+    mail.init_app(app)
+
+    from app.v1.utils.revocation import init_revocation_filter
+    init_revocation_filter(app)
+
+    from app.v1.utils.token_cache import init_token_cache
+    init_token_cache(app)
+
+    from app.v1.utils.decorators import report_auth_latency
+    app.after_request(report_auth_latency)
+
+    from app.v1.utils.compression import init_compression
+    init_compression(app)
 
     def index():
         """ Yummy Recipes API home page """
@@ -55,16 +70,22 @@ def create_app(config_name):
     app.register_blueprint(auth_blueprint)
 
     from app.v1.views.category_views import category_view, category_specific_view, \
-            category_search_view
+            category_search_view, category_export_view
     app.add_url_rule('/', view_func=index)
     app.add_url_rule('/api/v1/category/', view_func=category_view)
     app.add_url_rule('/api/v1/category/<int:category_id>', view_func=category_specific_view)
     app.add_url_rule('/api/v1/category/search', view_func=category_search_view)
+    app.add_url_rule('/api/v1/category/export', view_func=category_export_view)
 
-    from app.v1.views.recipe_views import recipe_view, recipe_specific_view, recipe_search_view
+    from app.v1.views.recipe_views import recipe_view, recipe_specific_view, \
+            recipe_search_view, recipe_bulk_view, user_recipe_search_view, \
+            recipe_ingredient_search_view
     app.add_url_rule('/api/v1/recipe/<int:category_id>/', view_func=recipe_view)
     app.add_url_rule('/api/v1/recipe/<int:category_id>/<int:recipe_id>', view_func= \
             recipe_specific_view)
     app.add_url_rule('/api/v1/recipe/<int:category_id>/search', view_func=recipe_search_view)
+    app.add_url_rule('/api/v1/recipe/<int:category_id>/bulk', view_func=recipe_bulk_view)
+    app.add_url_rule('/api/v1/recipe/search', view_func=user_recipe_search_view)
+    app.add_url_rule('/api/v1/recipe/ingredients', view_func=recipe_ingredient_search_view)
 
     return app
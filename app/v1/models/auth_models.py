@@ -1,11 +1,16 @@
 """ Auth module models. """
 
+import base64
+import hashlib
+import os
 from datetime import datetime, timedelta
 import jwt
 from flask import current_app
-from flask_bcrypt import generate_password_hash, check_password_hash
 from app import db
+from app.v1.utils.hashing import generate_password_hash, check_password_hash, needs_rehash
 from app.v1.utils.mixins import BaseMixin, TimestampMixin
+from app.v1.utils.revocation import get_revocation_filter
+from app.v1.utils.token_cache import get_token_cache
 
 # pylint: disable=W0703
 # pylint: disable=E1101
@@ -18,12 +23,13 @@ class User(BaseMixin, TimestampMixin, db.Model):
     username = db.Column(db.String(80), nullable=False, unique=True)
     email = db.Column(db.String(100), nullable=False, unique=True)
     password = db.Column(db.String(255), nullable=False)
-    categories = db.relationship('Category', order_by='Category.id', cascade="all, delete-orphan")
+    categories = db.relationship('Category', order_by='Category.id', cascade="all, delete-orphan", \
+            passive_deletes=True)
 
     def __init__(self, username, email, password):
         self.username = username
         self.email = email
-        self.password = generate_password_hash(password).decode('utf-8')
+        self.password = generate_password_hash(password)
 
     def __repr__(self):
         return "<User: {}>".format(self.username)
@@ -34,7 +40,11 @@ class User(BaseMixin, TimestampMixin, db.Model):
 
     def hash_password(self, password):
         """Encrypt password before storage"""
-        return generate_password_hash(password).decode('utf-8')
+        return generate_password_hash(password)
+
+    def password_needs_rehash(self):
+        """Check if password was hashed with a different work factor"""
+        return needs_rehash(self.password)
 
     def encode_token(self, user_id):
         """Generate user token"""
@@ -42,36 +52,101 @@ class User(BaseMixin, TimestampMixin, db.Model):
             payload = {
                 'exp': datetime.utcnow() + timedelta(days=14),
                 'iat': datetime.utcnow(),
-                'sub': user_id
+                'sub': user_id,
+                'jti': base64.urlsafe_b64encode(os.urandom(12)).decode('utf-8')
             }
             return jwt.encode(payload, current_app.config.get('SECRET'), algorithm='HS256')
         except Exception as error:
             return str(error)
 
     @staticmethod
-    def decode_token(token):
-        """Decode user token"""
-        revoked_token = RevokedToken.query.filter_by(token=str(token)).first()
-        if not revoked_token:
-            try:
-                payload = jwt.decode(token, current_app.config.get('SECRET'), algorithms=['HS256'])
-                return payload['sub']
-            except jwt.DecodeError:
-                return 'Sorry, this token could not be decoded.'
-        else:
+    def verify_token(token):
+        """Return payload of valid user token, signature is only verified on cache miss"""
+        token_cache = get_token_cache()
+        payload = token_cache.get(token)
+        if payload is None:
+            payload = jwt.decode(token, current_app.config.get('SECRET'), algorithms=['HS256'])
+            token_cache.put(token, payload)
+        return payload
+
+    @staticmethod
+    def load_from_token(token):
+        """
+        Return handle of user owning token. User row is only fetched, together with token
+        revocation status, if the revocation filter cannot rule out that token was revoked.
+        """
+        try:
+            payload = User.verify_token(token)
+        except jwt.InvalidTokenError:
+            return 'Sorry, this token could not be decoded.'
+        jti = RevokedToken.token_id(token, payload)
+        if not get_revocation_filter().might_be_revoked(jti):
+            return UserHandle(payload['sub'])
+        row = db.session.query(User, RevokedToken.id).outerjoin(RevokedToken, \
+                RevokedToken.jti == jti).filter(User.id == payload['sub']).first()
+        if not row:
+            return 'Sorry, user could not be found.'
+        if row[1]:
             return 'Sorry, this token is invalid.'
+        return UserHandle(payload['sub'], user=row[0])
+
+class UserHandle(object):
+    """
+    Stand-in for 'User' built from token subject. Provides user id without a database
+    query, full user row is loaded on first access to any other attribute. Views needing
+    the full row check that load() does not return None for a user deleted since login.
+    """
+
+    def __init__(self, user_id, user=None):
+        self.__dict__['id'] = user_id
+        self.__dict__['user'] = user
+
+    def __repr__(self):
+        return "<UserHandle: {}>".format(self.id)
+
+    def load(self):
+        """Return full user, fetching it on first use, None if user no longer exists"""
+        if self.__dict__['user'] is None:
+            self.__dict__['user'] = User.query.get(self.id)
+        return self.__dict__['user']
+
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.load(), name, value)
 
 class RevokedToken(BaseMixin, db.Model):
     """ Define the 'RevokedToken' model mapped to database table 'revoked_tokens'. """
 
     __tablename__ = 'revoked_tokens'
 
-    token = db.Column(db.String(500), unique=True, nullable=False)
-    revoked_on = db.Column(db.DateTime, nullable=False)
+    jti = db.Column(db.String(32), unique=True, nullable=False)
+    expires_on = db.Column(db.DateTime, nullable=False, index=True)
 
-    def __init__(self, token):
-        self.token = token
-        self.revoked_on = datetime.now()
+    def __init__(self, jti, expires_on):
+        self.jti = jti
+        self.expires_on = expires_on
 
     def __repr__(self):
-        return '<id: token: {}'.format(self.token)
+        return '<id: jti: {}'.format(self.jti)
+
+    @staticmethod
+    def token_id(token, payload):
+        """Unique token ID, derived from the token itself for tokens issued without one"""
+        return payload.get('jti') or hashlib.sha256(str(token).encode('utf-8')).hexdigest()[:32]
+
+    @classmethod
+    def from_token(cls, token):
+        """Revocation record for a valid user token"""
+        payload = User.verify_token(token)
+        return cls(jti=cls.token_id(token, payload), \
+                expires_on=datetime.utcfromtimestamp(payload['exp']))
+
+    @staticmethod
+    def purge_expired():
+        """Delete revocation records of tokens that have expired, returns number deleted"""
+        count = RevokedToken.query.filter(RevokedToken.expires_on < datetime.utcnow()). \
+                delete(synchronize_session=False)
+        db.session.commit()
+        return count
@@ -13,8 +13,9 @@ class Category(BaseMixin, TimestampMixin, db.Model):
     __tablename__ = 'categories'
 
     category_name = db.Column(db.String(50), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey(User.id))
-    recipes = db.relationship('Recipe', order_by='Recipe.id', cascade="all, delete-orphan")
+    user_id = db.Column(db.Integer, db.ForeignKey(User.id, ondelete='CASCADE'))
+    recipes = db.relationship('Recipe', order_by='Recipe.id', cascade="all, delete-orphan", \
+            back_populates='category', passive_deletes=True)
 
     def __init__(self, category_name, user_id):
         self.category_name = category_name
@@ -22,3 +23,6 @@ class Category(BaseMixin, TimestampMixin, db.Model):
 
     def __repr__(self):
         return "<Category: {}>".format(self.category_name)
+
+db.Index('ix_categories_user_id_lower_category_name', Category.user_id, \
+        db.func.lower(Category.category_name), unique=True)
@@ -0,0 +1,26 @@
+""" Mail module models. """
+
+from app import db
+from app.v1.utils.mixins import BaseMixin, TimestampMixin
+
+# pylint: disable=W0703
+# pylint: disable=E1101
+
+class QueuedMail(BaseMixin, TimestampMixin, db.Model):
+    """ Define the 'QueuedMail' model mapped to database table 'mail_queue'. """
+
+    __tablename__ = 'mail_queue'
+
+    recipient = db.Column(db.String(100), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+
+    def __init__(self, recipient, subject, body):
+        self.recipient = recipient
+        self.subject = subject
+        self.body = body
+        self.attempts = 0
+
+    def __repr__(self):
+        return "<QueuedMail: {}>".format(self.subject)
@@ -1,7 +1,10 @@
 """ Recipe module models."""
 
+from sqlalchemy import DDL, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from app import db
 from app.v1.models.category_models import Category
+from app.v1.utils.ingredients import parse_ingredients
 from app.v1.utils.mixins import BaseMixin, TimestampMixin
 
 # pylint: disable=W0703
@@ -15,7 +18,11 @@ class Recipe(BaseMixin, TimestampMixin, db.Model):
     recipe_name = db.Column(db.String(100), nullable=False)
     ingredients = db.Column(db.String(800), nullable=False)
     directions = db.Column(db.String(2000), nullable=False)
-    category_id = db.Column(db.Integer, db.ForeignKey(Category.id))
+    category_id = db.Column(db.Integer, db.ForeignKey(Category.id, ondelete='CASCADE'))
+    search_vector = db.deferred(db.Column(db.Text().with_variant(TSVECTOR(), 'postgresql')))
+    category = db.relationship(Category, back_populates='recipes')
+    ingredient_terms = db.relationship('RecipeIngredient', cascade="all, delete-orphan", \
+            passive_deletes=True)
 
     def __init__(self, recipe_name, ingredients, directions, category_id):
         self.recipe_name = recipe_name
@@ -25,3 +32,150 @@ class Recipe(BaseMixin, TimestampMixin, db.Model):
 
     def __repr__(self):
         return "<Recipe: {}>".format(self.recipe_name)
+
+    def index_ingredients(self):
+        """ Update ingredient terms of recipe to match its ingredients, saved with recipe """
+        terms = parse_ingredients(self.ingredients)
+        kept = [item for item in self.ingredient_terms if item.term in terms]
+        self.ingredient_terms = kept + [RecipeIngredient(term) for term in \
+                sorted(terms - {item.term for item in kept})]
+
+    @staticmethod
+    def find_for_user(user_id, category_id, recipe_id):
+        """
+        Returns (category, recipe) of user with a single query joining category to recipe.
+        Category is None if user has no such category, recipe is None if category has no
+        such recipe.
+        """
+        row = db.session.query(Category, Recipe).outerjoin(Recipe, db.and_( \
+                Recipe.category_id == Category.id, Recipe.id == recipe_id)). \
+                filter(Category.id == category_id, Category.user_id == user_id).first()
+        return row if row is not None else (None, None)
+
+    @staticmethod
+    def owned_by(user_id, category_id, recipe_id):
+        """ Returns criteria matching recipe of category of user """
+        return db.and_(Recipe.id == recipe_id, Recipe.category_id == category_id, \
+                db.session.query(Category.id).filter(Category.id == category_id, \
+                Category.user_id == user_id).exists())
+
+    @staticmethod
+    def update_for_user(user_id, category_id, recipe_id, **values):
+        """
+        Update recipe of category of user in one statement and replace its ingredient terms,
+        returns the updated row or None if user has no such recipe. The caller commits.
+        """
+        row = Recipe.update_returning(Recipe.owned_by(user_id, category_id, recipe_id), \
+                RECIPE_COLUMNS, **values)
+        if row is not None and 'ingredients' in values:
+            db.session.execute(RecipeIngredient.__table__.delete().where( \
+                    RecipeIngredient.recipe_id == recipe_id))
+            terms = sorted(parse_ingredients(values['ingredients']))
+            if terms:
+                db.session.execute(RecipeIngredient.__table__.insert().values( \
+                        [{'recipe_id': recipe_id, 'term': term} for term in terms]))
+        return row
+
+    @staticmethod
+    def delete_for_user(user_id, category_id, recipe_id):
+        """
+        Delete recipe of category of user in one statement, returns the deleted row or None
+        if user has no such recipe. The caller commits.
+        """
+        criteria = Recipe.owned_by(user_id, category_id, recipe_id)
+        if db.engine.dialect.name != 'postgresql':
+            # ingredient terms are otherwise deleted by their ON DELETE CASCADE foreign key
+            db.session.execute(RecipeIngredient.__table__.delete().where( \
+                    RecipeIngredient.recipe_id.in_(db.session.query(Recipe.id).filter(criteria))))
+        return Recipe.delete_returning(criteria, RECIPE_COLUMNS)
+
+    @staticmethod
+    def delete_in_category(user_id, category_id):
+        """
+        Delete all recipes of category of user, along with their ingredient terms, for
+        databases that do not enforce the ON DELETE CASCADE foreign keys. The caller commits.
+        """
+        criteria = Recipe.category_id.in_(db.session.query(Category.id).filter( \
+                Category.id == category_id, Category.user_id == user_id))
+        if db.engine.dialect.name != 'postgresql':
+            db.session.execute(RecipeIngredient.__table__.delete().where( \
+                    RecipeIngredient.recipe_id.in_(db.session.query(Recipe.id).filter(criteria))))
+        db.session.execute(Recipe.__table__.delete().where(criteria))
+
+    @staticmethod
+    def bulk_create(category_id, recipes, batch_size=500):
+        """
+        Insert recipes into category with one multi-row INSERT per batch, along with their
+        ingredient terms. Returns ids of recipes in order, the caller commits.
+        """
+        ids = []
+        for start in range(0, len(recipes), batch_size):
+            batch = [dict(recipe, category_id=category_id) for recipe in \
+                    recipes[start:start + batch_size]]
+            db.session.execute(Recipe.__table__.insert().values(batch))
+            names = [recipe['recipe_name'].lower() for recipe in batch]
+            created = dict(db.session.query(db.func.lower(Recipe.recipe_name), Recipe.id). \
+                    filter(Recipe.category_id == category_id, \
+                    db.func.lower(Recipe.recipe_name).in_(names)))
+            terms = [{'recipe_id': created[name], 'term': term} for name, recipe in \
+                    zip(names, batch) for term in sorted(parse_ingredients(recipe['ingredients']))]
+            for term_start in range(0, len(terms), batch_size):
+                db.session.execute(RecipeIngredient.__table__.insert().values( \
+                        terms[term_start:term_start + batch_size]))
+            ids.extend(created[name] for name in names)
+        return ids
+
+    @staticmethod
+    def index_all_ingredients(batch_size=500):
+        """Update ingredient terms of all recipes in batches, returns number of recipes"""
+        count, last_id = 0, 0
+        while True:
+            recipes = Recipe.query.filter(Recipe.id > last_id).order_by(Recipe.id). \
+                    options(db.subqueryload(Recipe.ingredient_terms)).limit(batch_size).all()
+            if not recipes:
+                return count
+            for recipe in recipes:
+                recipe.index_ingredients()
+            count, last_id = count + len(recipes), recipes[-1].id
+            db.session.commit()
+
+class RecipeIngredient(db.Model):
+    """Define the 'RecipeIngredient' model mapped to database table 'recipe_ingredients'."""
+
+    __tablename__ = 'recipe_ingredients'
+
+    recipe_id = db.Column(db.Integer, db.ForeignKey(Recipe.id, ondelete='CASCADE'), \
+            primary_key=True)
+    term = db.Column(db.String(50), primary_key=True)
+
+    def __init__(self, term):
+        self.term = term
+
+    def __repr__(self):
+        return "<RecipeIngredient: {}>".format(self.term)
+
+# Columns returned by single statement writes, leaving out the search vector
+RECIPE_COLUMNS = [column for column in Recipe.__table__.c if column.key != 'search_vector']
+
+db.Index('ix_recipes_category_id_lower_recipe_name', Recipe.category_id, \
+        db.func.lower(Recipe.recipe_name), unique=True)
+db.Index('ix_recipes_search_vector', Recipe.search_vector, postgresql_using='gin')
+db.Index('ix_recipe_ingredients_term_recipe_id', RecipeIngredient.term, \
+        RecipeIngredient.recipe_id)
+
+# search_vector is maintained by the database so that it is also kept up to date by
+# statements that bypass the ORM
+event.listen(Recipe.__table__, 'after_create', DDL("""
+    CREATE OR REPLACE FUNCTION recipes_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.recipe_name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.ingredients, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.directions, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    CREATE TRIGGER recipes_search_vector_update
+        BEFORE INSERT OR UPDATE OF recipe_name, ingredients, directions ON recipes
+        FOR EACH ROW EXECUTE PROCEDURE recipes_search_vector_update();
+""").execute_if(dialect='postgresql'))
@@ -0,0 +1,115 @@
+""" Compression of API responses and caching of precompressed API docs """
+
+import gzip
+import hashlib
+import threading
+from flask import current_app, g, request, Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# pylint: disable=C0103
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/css', 'text/plain', \
+        'application/javascript', 'image/svg+xml')
+DOCS_ENDPOINTS = ('flasgger.static', 'flasgger.apispec_1')
+
+def choose_encoding():
+    """ Returns best content encoding accepted by client, None if none is supported """
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br'] and accepted['br'] >= accepted['gzip']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+def encode(data, encoding, best=False):
+    """ Returns data compressed with encoding, with the highest level if best is True """
+    if encoding == 'br':
+        quality = 11 if best else current_app.config.get('COMPRESS_BROTLI_QUALITY', 4)
+        return brotli.compress(data, quality=quality)
+    level = 9 if best else current_app.config.get('COMPRESS_LEVEL', 6)
+    return gzip.compress(data, compresslevel=level)
+
+class DocsCache(object):
+    """
+    Holds API docs assets and generated spec compressed at the highest level once per
+    encoding, so that later requests are served from memory without regenerating them.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def get(self, path, encoding):
+        """ Returns cached (body, mimetype, etag) of path, None if not cached yet """
+        return self.entries.get((path, encoding))
+
+    def put(self, path, encoding, data, mimetype):
+        """ Compress and cache data of path, returns cached entry """
+        body = encode(data, encoding, best=True) if encoding else data
+        entry = (body, mimetype, hashlib.sha1(data).hexdigest())
+        with self.lock:
+            self.entries[(path, encoding)] = entry
+        return entry
+
+def make_docs_response(entry, encoding):
+    """ Returns conditional response of cached docs entry with long lived cache headers """
+    body, mimetype, etag = entry
+    response = Response(body, mimetype=mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get('DOCS_CACHE_MAX_AGE', 604800)
+    response.set_etag(etag, weak=encoding is not None)
+    return response.make_conditional(request)
+
+def serve_cached_docs():
+    """ Serve API docs asset or spec from cache if it has been requested before """
+    if request.endpoint in DOCS_ENDPOINTS:
+        encoding = choose_encoding()
+        entry = current_app.extensions['docs_cache'].get(request.path, encoding)
+        if entry is not None:
+            g.cached_docs = True
+            return make_docs_response(entry, encoding)
+    return None
+
+def compress_response(response):
+    """
+    Compress response body with encoding negotiated by Accept-Encoding header if it is at
+    least COMPRESS_MIN_SIZE bytes. API docs are compressed once and cached.
+    """
+    if g.get('cached_docs') or response.status_code != 200 or \
+            'Content-Encoding' in response.headers:
+        return response
+    if request.endpoint in DOCS_ENDPOINTS:
+        encoding = choose_encoding()
+        response.direct_passthrough = False
+        entry = current_app.extensions['docs_cache'].put(request.path, encoding, \
+                response.get_data(), response.mimetype)
+        response.close()
+        return make_docs_response(entry, encoding)
+    if response.is_streamed or response.direct_passthrough or \
+            response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    data = response.get_data()
+    if len(data) < current_app.config.get('COMPRESS_MIN_SIZE', 500):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding()
+    if encoding:
+        response.set_data(encode(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+    return response
+
+def init_compression(app):
+    """ Compress responses of application and cache its compressed API docs """
+    app.extensions['docs_cache'] = DocsCache()
+    app.before_request(serve_cached_docs)
+    app.after_request(compress_response)
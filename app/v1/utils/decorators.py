@@ -1,7 +1,8 @@
 """ Decorator functions for auth, category and recipe modules """
 
+import time
 from functools import wraps
-from flask import request, jsonify
+from flask import current_app, g, request, jsonify
 from app.v1.models.auth_models import User
 
 def authenticate(func):
@@ -10,12 +11,13 @@ def authenticate(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
         """ Authentication wrapper. """
+        started = time.perf_counter()
         try:
             auth_header = request.headers.get('Authorization')
             access_token = auth_header.split(' ')[1]
-            user_id = User.decode_token(access_token)
-            if not isinstance(user_id, str):
-                user = User.query.filter_by(id=user_id).first()
+            user = User.load_from_token(access_token)
+            g.auth_latency = time.perf_counter() - started
+            if not isinstance(user, str):
                 return func(access_token, user, *args, **kwargs)
             else:
                 response = jsonify({'message': 'Sorry, user could not be found.'})
@@ -25,3 +27,12 @@ def authenticate(func):
             response.status_code = 401
         return response
     return wrapper
+
+def report_auth_latency(response):
+    """ Reports time spent authenticating request in Server-Timing header and debug log. """
+    auth_latency = g.get('auth_latency')
+    if auth_latency is not None:
+        response.headers.add('Server-Timing', 'auth;dur=%.3f' % (auth_latency * 1000))
+        current_app.logger.debug('%s %s authenticated in %.3f ms', request.method, \
+                request.path, auth_latency * 1000)
+    return response
@@ -0,0 +1,30 @@
+""" Entity tags for conditional GET requests of category and recipe views """
+
+import hashlib
+from flask import request, Response
+from sqlalchemy import func
+
+def make_etag(*parts):
+    """ Returns strong entity tag of parts, such as id and date modified of a row """
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+def list_etag(query, model, *parts):
+    """
+    Returns (entity tag, count) of list of rows of query. Tag is computed from their count
+    and latest date modified along with query string of request, which selects the page and
+    fields shown. Count is passed on to the paginator so rows are only counted once.
+    """
+    latest, count = query.with_entities(func.max(model.date_modified), func.count()). \
+            order_by(None).first()
+    return make_etag(latest, count, request.query_string, *parts), count
+
+def not_modified(etag):
+    """
+    Returns 304 response if request has a matching If-None-Match header, otherwise None.
+    Tags are compared weakly as compressed responses carry the weak form of the same tag.
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
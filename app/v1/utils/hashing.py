@@ -0,0 +1,48 @@
+""" Password hashing and verification offloaded to a bounded pool of worker processes """
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import bcrypt
+from flask import current_app
+
+# pylint: disable=C0103
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def _hash_password(password, rounds):
+    """ Hash password with given bcrypt work factor """
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+def _check_password(pw_hash, password):
+    """ Returns True if password matches hash """
+    return bcrypt.checkpw(password.encode('utf-8'), pw_hash.encode('utf-8'))
+
+def _get_pool(pool_size):
+    """ Returns worker pool of pool_size processes, created on first use of that size """
+    pool = _pools.get(pool_size)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(pool_size)
+            if pool is None:
+                pool = _pools[pool_size] = ProcessPoolExecutor(max_workers=pool_size)
+    return pool
+
+def _run(func, *args):
+    """ Run func in worker pool, or inline if BCRYPT_POOL_SIZE is 0 """
+    pool_size = current_app.config.get('BCRYPT_POOL_SIZE', 0)
+    if not pool_size:
+        return func(*args)
+    return _get_pool(pool_size).submit(func, *args).result()
+
+def generate_password_hash(password):
+    """ Hash password with work factor set by BCRYPT_LOG_ROUNDS """
+    return _run(_hash_password, password, current_app.config.get('BCRYPT_LOG_ROUNDS', 12))
+
+def check_password_hash(pw_hash, password):
+    """ Returns True if password matches hash """
+    return _run(_check_password, pw_hash, password)
+
+def needs_rehash(pw_hash):
+    """ Returns True if hash was generated with a work factor other than BCRYPT_LOG_ROUNDS """
+    return int(pw_hash.split('$')[2]) != current_app.config.get('BCRYPT_LOG_ROUNDS', 12)
@@ -0,0 +1,64 @@
+""" Parser extracting normalised ingredient terms from free-text recipe ingredients """
+
+import re
+
+# Words describing amounts and preparation rather than the ingredient itself
+UNITS = {
+    'tsp', 'tsps', 'teaspoon', 'tbsp', 'tbsps', 'tablespoon', 'cup', 'ml', 'l', 'litre',
+    'liter', 'g', 'gram', 'kg', 'oz', 'ounce', 'lb', 'lbs', 'pound', 'pinch', 'dash',
+    'clove', 'slice', 'piece', 'can', 'packet', 'bunch', 'handful', 'drop'
+}
+STOP_WORDS = {
+    'a', 'an', 'and', 'approx', 'about', 'for', 'of', 'or', 'plus', 'to', 'taste', 'the',
+    'with', 'fresh', 'large', 'medium', 'small', 'chopped', 'diced', 'minced', 'sliced',
+    'peeled', 'softened', 'melted', 'beaten', 'grated', 'optional', 'all', 'purpose'
+}
+# Longest ingredient name, in words, that is indexed and searched as one term
+MAX_PHRASE_WORDS = 3
+
+def normalise(word):
+    """ Returns lower case singular form of word so that 'Eggs' and 'egg' match """
+    word = word.lower()
+    if len(word) > 3 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('oes'):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+def ingredient_names(text):
+    """
+    Returns ingredient names in text as lists of normalised words. Names end at
+    punctuation, quantities, units and preparation notes, parenthesised remarks are dropped.
+    """
+    names, name = [], []
+    for token in re.findall(r'[^\W\d_]+|\S', re.sub(r'\([^)]*\)', ' ', text).lower()):
+        term = normalise(token)
+        if token.isalpha() and len(term) > 1 and not {token, term} & (UNITS | STOP_WORDS):
+            name.append(term)
+        elif name:
+            names.append(name)
+            name = []
+    if name:
+        names.append(name)
+    return names
+
+def parse_ingredients(text):
+    """
+    Returns set of ingredient terms in text, every run of up to MAX_PHRASE_WORDS words of
+    each ingredient name, so that 'ground cinnamon' is found by 'cinnamon' too.
+    """
+    terms = set()
+    for name in ingredient_names(text):
+        for size in range(1, min(len(name), MAX_PHRASE_WORDS) + 1):
+            terms.update(' '.join(name[i:i + size])[:50] for i in range(len(name) - size + 1))
+    return terms
+
+def parse_ingredient_query(text):
+    """
+    Returns set of terms of comma separated ingredients searched for, one per ingredient
+    name so that 'brown sugar' only matches recipes containing brown sugar. Longer names
+    are searched by their last MAX_PHRASE_WORDS words.
+    """
+    return {' '.join(name[-MAX_PHRASE_WORDS:])[:50] for name in ingredient_names(text)}
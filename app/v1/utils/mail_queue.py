@@ -0,0 +1,56 @@
+""" Durable queue of outbound emails, drained by the mailer worker """
+
+import smtplib
+from flask import current_app
+from flask_mail import Message
+from app import db, mail
+from app.v1.models.mail_models import QueuedMail
+
+# pylint: disable=E1101
+
+SENDER = 'hckalii2018@gmail.com'
+
+def queue_mail(user, subject, text):
+    """ Add email to mail queue, it is stored when the current session is committed """
+    db.session.add(QueuedMail(recipient=user.email, subject=subject, body=text))
+    return True
+
+def send_queued_mail(batch_size=50, max_attempts=5):
+    """
+    Send a batch of queued emails over a single SMTP connection, returns number of emails
+    sent. Sent emails are removed from queue, failed ones are retried until
+    max_attempts is reached and then removed too, as their bodies may hold passwords.
+    """
+    queued = QueuedMail.query.filter(QueuedMail.attempts < max_attempts). \
+            order_by(QueuedMail.id).limit(batch_size).with_for_update(skip_locked=True).all()
+    sent = 0
+    try:
+        if queued:
+            with mail.connect() as connection:
+                for queued_mail in queued:
+                    msg = Message(queued_mail.subject, sender=SENDER, \
+                            recipients=[queued_mail.recipient])
+                    msg.body = queued_mail.body
+                    try:
+                        connection.send(msg)
+                    except smtplib.SMTPServerDisconnected:
+                        record_failure(queued_mail, max_attempts)
+                        break
+                    except smtplib.SMTPException:
+                        record_failure(queued_mail, max_attempts)
+                    else:
+                        db.session.delete(queued_mail)
+                        sent += 1
+    except (smtplib.SMTPException, OSError):
+        current_app.logger.exception('Could not connect to mail server.')
+    finally:
+        db.session.commit()
+    return sent
+
+def record_failure(queued_mail, max_attempts):
+    """ Count failed attempt to send email, giving up on it after max_attempts """
+    queued_mail.attempts += 1
+    if queued_mail.attempts >= max_attempts:
+        current_app.logger.warning('Giving up on email %d to %s after %d attempts.', \
+                queued_mail.id, queued_mail.recipient, queued_mail.attempts)
+        db.session.delete(queued_mail)
@@ -20,6 +20,37 @@ class BaseMixin(object):
         db.session.delete(self)
         db.session.commit()
 
+    @classmethod
+    def update_returning(cls, criteria, columns=None, **values):
+        """
+        Update row matching criteria with one UPDATE ... RETURNING statement, returns columns
+        of the updated row or None if no row matched. Other databases select the row after
+        updating it. The caller commits.
+        """
+        columns = columns or list(cls.__table__.c)
+        statement = cls.__table__.update().where(criteria).values(**values)
+        if db.engine.dialect.name == 'postgresql':
+            return db.session.execute(statement.returning(*columns)).first()
+        if not db.session.execute(statement).rowcount:
+            return None
+        return db.session.execute(db.select(columns).where(criteria)).first()
+
+    @classmethod
+    def delete_returning(cls, criteria, columns=None):
+        """
+        Delete row matching criteria with one DELETE ... RETURNING statement, returns columns
+        of the deleted row or None if no row matched. Other databases select the row before
+        deleting it. The caller commits.
+        """
+        columns = columns or list(cls.__table__.c)
+        statement = cls.__table__.delete().where(criteria)
+        if db.engine.dialect.name == 'postgresql':
+            return db.session.execute(statement.returning(*columns)).first()
+        row = db.session.execute(db.select(columns).where(criteria)).first()
+        if row is not None:
+            db.session.execute(statement)
+        return row
+
 class TimestampMixin(object):
     """ Database logging of data manipulation timestamps. """
 
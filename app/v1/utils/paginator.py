@@ -1,9 +1,57 @@
 """ Paginator function for category and recipe modules. """
 
+import base64
 from math import ceil
+from sqlalchemy import func
 
-def get_paginated_results(request, results, url):
-    """ Returns previous and next pagination links. """
+def encode_cursor(value):
+    """ Returns opaque cursor for key value """
+    return base64.urlsafe_b64encode(str(value).encode('utf-8')).decode('utf-8')
+
+def decode_cursor(cursor):
+    """ Returns key value of opaque cursor, raises ValueError for invalid cursor """
+    return int(base64.urlsafe_b64decode(cursor.encode('utf-8')).decode('utf-8'))
+
+def get_keyset_results(request, query, url, key, limit):
+    """
+    Returns page of rows after or before a cursor, seeking on key instead of skipping rows
+    so that deep pages cost the same as the first one. Links stay valid as rows are added.
+    """
+    paginated = {'is_good_query': True, 'page': None, 'pages': None}
+    query = query.order_by(None)
+
+    if request.values.get('before'):
+        before = decode_cursor(request.values.get('before'))
+        rows = query.filter(key < before).order_by(key.desc()).limit(limit + 1).all()
+        has_previous, has_next = len(rows) > limit, True
+        rows = rows[:limit][::-1]
+    else:
+        after = None
+        if request.values.get('after'):
+            after = decode_cursor(request.values.get('after'))
+            query = query.filter(key > after)
+        rows = query.order_by(key).limit(limit + 1).all()
+        has_previous, has_next = after is not None, len(rows) > limit
+        rows = rows[:limit]
+
+    paginated['previous_link'] = ''
+    paginated['next_link'] = ''
+    if rows and has_previous:
+        paginated['previous_link'] = url + 'before=%s&limit=%d' % \
+                (encode_cursor(getattr(rows[0], key.key)), limit)
+    if rows and has_next:
+        paginated['next_link'] = url + 'after=%s&limit=%d' % \
+                (encode_cursor(getattr(rows[-1], key.key)), limit)
+    paginated['results'] = rows
+    return paginated
+
+def get_paginated_results(request, query, url, key=None, count=None):
+    """
+    Returns previous and next pagination links, only the rows of the requested page are
+    loaded from query using LIMIT/OFFSET. If an 'after' or 'before' cursor is requested,
+    rows are paged by key instead, see get_keyset_results. Rows are counted unless their
+    count is passed in.
+    """
     paginated = {}
 
     try:
@@ -15,8 +63,13 @@ def get_paginated_results(request, results, url):
             limit = int(request.values.get('limit'))
         else:
             limit = 6
+        if page < 1 or limit < 1:
+            raise ValueError('Page and limit must be positive.')
+        if key is not None and ('after' in request.values or 'before' in request.values):
+            return get_keyset_results(request, query, url, key, limit)
 
-        count = len(results)
+        if count is None:
+            count = query.with_entities(func.count()).order_by(None).scalar()
         start = page * limit - limit + 1
 
         paginated['is_good_query'] = True
@@ -26,6 +79,7 @@ def get_paginated_results(request, results, url):
         if count < start:
             paginated['previous_link'] = ''
             paginated['next_link'] = ''
+            paginated['results'] = []
         else:
             if page == 1:
                 paginated['previous_link'] = ''
@@ -35,7 +89,7 @@ def get_paginated_results(request, results, url):
                 paginated['next_link'] = ''
             else:
                 paginated['next_link'] = url + 'page=%d&limit=%d' % (page + 1, limit)
-        paginated['results'] = results[(start - 1):(start - 1 + limit)]
+            paginated['results'] = query.limit(limit).offset(start - 1).all()
     except ValueError:
         paginated['is_good_query'] = False
     return paginated
@@ -0,0 +1,36 @@
+""" Projection of recipe list results to fields requested by clients """
+
+from sqlalchemy.orm import load_only
+from app.v1.utils.serializers import RECIPE_FIELDS
+
+RECIPE_SUMMARY_FIELDS = ['id', 'recipe_name', 'category_id', 'date_created', 'date_modified']
+
+def get_fields(request, fields=None, summary_fields=None):
+    """
+    Returns fields requested with 'fields' as a comma separated list or with 'view=summary',
+    all fields if neither is given and None if an unknown field or view is requested.
+    """
+    fields = fields or RECIPE_FIELDS
+    if request.values.get('fields'):
+        requested = {field.strip() for field in request.values.get('fields').split(',')}
+        requested.discard('')
+        if not requested <= set(fields):
+            return None
+        return [field for field in fields if field in requested or field == 'id']
+    if request.values.get('view', 'full') == 'summary':
+        return summary_fields or RECIPE_SUMMARY_FIELDS
+    if request.values.get('view', 'full') != 'full':
+        return None
+    return fields
+
+def get_field_params(request):
+    """ Returns projection query string of request to carry over to pagination links """
+    if request.values.get('fields'):
+        return 'fields=' + request.values.get('fields') + '&'
+    if request.values.get('view'):
+        return 'view=' + request.values.get('view') + '&'
+    return ''
+
+def project(query, fields):
+    """ Load only columns of fields in query, other columns are left out of SELECT """
+    return query.options(load_only(*[field for field in fields if field in RECIPE_FIELDS]))
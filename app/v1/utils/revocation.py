@@ -0,0 +1,143 @@
+""" In-process filter of revoked access tokens shared by all request threads of a worker """
+
+import hashlib
+import threading
+import time
+from datetime import datetime
+from math import ceil, log
+from flask import current_app
+from app import db
+
+# pylint: disable=E1101
+
+class BloomFilter(object):
+    """ Fixed size Bloom filter over string keys. """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(int(ceil(-capacity * log(error_rate) / (log(2) ** 2))), 8)
+        self.hash_count = max(int(round(self.size / capacity * log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        """ Derive bit positions from one digest using double hashing """
+        digest = hashlib.sha256(key.encode('utf-8')).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        """ Add key to filter """
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) \
+                for position in self._positions(key))
+
+class RevocationFilter(object):
+    """
+    Answers "definitely not revoked" for access token IDs without a database round trip.
+    Tokens revoked by this worker are added immediately, tokens revoked by other worker
+    processes are picked up by reloading all unexpired revocation records at most every
+    refresh_interval seconds. A hit in the filter is always confirmed against the database.
+    Expired revocation records are purged in the background at most every purge_interval
+    seconds, which keeps reloads small.
+    """
+
+    def __init__(self, app, capacity, error_rate, refresh_interval, purge_interval=None):
+        self.app = app
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self.purge_interval = purge_interval
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.added = []
+        self.refreshed_at = None
+        self.purged_at = time.time()
+
+    def add(self, jti):
+        """ Record token ID revoked by this worker """
+        with self.lock:
+            self.bloom.add(jti)
+            self.added.append(jti)
+
+    def rebuild(self):
+        """ Reload filter contents on next refresh, dropping purged records """
+        with self.lock:
+            self.refreshed_at = None
+
+    def purge(self):
+        """ Delete expired revocation records and rebuild filter without them """
+        from app.v1.models.auth_models import RevokedToken
+
+        with self.app.app_context():
+            try:
+                RevokedToken.purge_expired()
+            finally:
+                db.session.remove()
+        self.rebuild()
+
+    def schedule_purge(self):
+        """ Start background purge if purge_interval has elapsed since last one """
+        now = time.time()
+        if self.purge_interval is None or now - self.purged_at < self.purge_interval:
+            return
+        self.purged_at = now
+        thread = threading.Thread(target=self.purge)
+        thread.daemon = True
+        thread.start()
+
+    def refresh(self):
+        """
+        Reload token IDs of all unexpired revocation records, including those revoked by other
+        workers. Records are not read from the highest id seen, as a revocation with a lower id
+        may commit after a higher one was read. Tokens this worker revokes while records are
+        loaded are carried over to the new filter.
+        """
+        from app.v1.models.auth_models import RevokedToken
+
+        now = time.time()
+        if self.refreshed_at is not None and now - self.refreshed_at < self.refresh_interval:
+            return
+        if not self.refresh_lock.acquire(False):
+            return
+        try:
+            self.refreshed_at = now
+            self.schedule_purge()
+            with self.lock:
+                self.added = []
+            jtis = [row.jti for row in db.session.query(RevokedToken.jti). \
+                    filter(RevokedToken.expires_on >= datetime.utcnow())]
+            bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+            for jti in jtis:
+                bloom.add(jti)
+            with self.lock:
+                for jti in self.added:
+                    bloom.add(jti)
+                self.bloom = bloom
+                self.added = []
+        finally:
+            self.refresh_lock.release()
+
+    def might_be_revoked(self, jti):
+        """ Returns False if token with token ID jti has definitely not been revoked """
+        self.refresh()
+        return jti in self.bloom
+
+def init_revocation_filter(app):
+    """ Attach a revocation filter to application """
+    app.extensions['revocation_filter'] = RevocationFilter(
+        app,
+        app.config.get('REVOKED_TOKEN_FILTER_CAPACITY', 100000),
+        app.config.get('REVOKED_TOKEN_FILTER_ERROR_RATE', 0.001),
+        app.config.get('REVOKED_TOKEN_REFRESH_INTERVAL', 5),
+        app.config.get('REVOKED_TOKEN_PURGE_INTERVAL'))
+
+def get_revocation_filter():
+    """ Returns revocation filter of current application """
+    return current_app.extensions['revocation_filter']
@@ -0,0 +1,116 @@
+""" Search functions for category and recipe modules """
+
+import re
+from contextlib import contextmanager
+from flask import current_app
+from sqlalchemy import case, false, func, or_
+from app import db
+from app.v1.models.recipe_models import Recipe
+
+# pylint: disable=E1101
+
+SIMILARITY_THRESHOLD = 0.3
+SUGGESTION_THRESHOLD = 0.1
+MAX_SCORED_MATCHES = 100
+
+SET_SIMILARITY_THRESHOLD = "SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"
+
+def rank_recipes(query, q):
+    """
+    Filter recipe query to recipes whose name, ingredients or directions match all words
+    of q, best matches first. Uses the full text index on PostgreSQL and substring
+    matching elsewhere.
+    """
+    if not q:
+        return query.order_by(Recipe.id)
+    if db.engine.dialect.name != 'postgresql':
+        pattern = '%' + q + '%'
+        return query.filter(or_(Recipe.recipe_name.ilike(pattern), \
+                Recipe.ingredients.ilike(pattern), Recipe.directions.ilike(pattern))). \
+                order_by(Recipe.id)
+    tsquery = func.plainto_tsquery('english', q)
+    return query.filter(Recipe.search_vector.op('@@')(tsquery)). \
+            order_by(func.ts_rank_cd(Recipe.search_vector, tsquery).desc(), Recipe.id)
+
+def trigrams(text):
+    """ Returns set of trigrams of text, extracted the same way as pg_trgm does """
+    result = set()
+    for word in re.findall(r'[^\W_]+', text.lower()):
+        word = '  ' + word + ' '
+        result.update(word[i:i + 3] for i in range(len(word) - 2))
+    return result
+
+def similarity(text, other):
+    """ Returns share of trigrams common to both texts, from 0 to 1 like pg_trgm """
+    first, second = trigrams(text), trigrams(other)
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+def has_pg_trgm():
+    """ Returns True if pg_trgm extension is installed in database, checked once per app """
+    if 'pg_trgm' not in current_app.extensions:
+        installed = False
+        if db.engine.dialect.name == 'postgresql':
+            installed = db.session.execute( \
+                    "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'").scalar() is not None
+        current_app.extensions['pg_trgm'] = installed
+    return current_app.extensions['pg_trgm']
+
+@contextmanager
+def similarity_threshold(threshold):
+    """ Sets threshold of the pg_trgm % operator for the statements run in the block """
+    previous = db.session.execute( \
+            "SELECT current_setting('pg_trgm.similarity_threshold', true)").scalar()
+    db.session.execute(SET_SIMILARITY_THRESHOLD, {'threshold': str(threshold)})
+    try:
+        yield
+    finally:
+        db.session.execute(SET_SIMILARITY_THRESHOLD, \
+                {'threshold': previous or str(SIMILARITY_THRESHOLD)})
+
+def _score_rows(query, column, key, q):
+    """
+    Returns (score, key, value) of rows of query sharing a trigram with q, most similar
+    first. Rows are narrowed in SQL to those containing a two letter part of a trigram of
+    q, so only candidates are scored in Python.
+    """
+    parts = {trigram.strip() for trigram in trigrams(q)}
+    patterns = sorted('%' + part + '%' for part in parts if len(part) > 1)
+    if not patterns:
+        return []
+    candidates = query.order_by(None).with_entities(key, column). \
+            filter(or_(*[column.ilike(pattern) for pattern in patterns]))
+    scored = [(similarity(value, q), row_key, value) for row_key, value in candidates]
+    return sorted(scored, key=lambda item: (-item[0], item[1]))
+
+def fuzzy_search(query, column, key, q):
+    """
+    Filter query to rows whose column is similar to q, most similar first. Uses pg_trgm
+    and its trigram indexes when installed, otherwise scores candidate rows in Python and
+    keeps the MAX_SCORED_MATCHES best of them.
+    """
+    if not q:
+        return query.order_by(key)
+    if has_pg_trgm():
+        # % is the pg_trgm similarity operator, doubled to survive pyformat parameters
+        return query.filter(column.op('%%')(q)). \
+                order_by(func.similarity(column, q).desc(), key)
+    ranks = {row_key: rank for rank, (score, row_key, _) in \
+            enumerate(_score_rows(query, column, key, q)[:MAX_SCORED_MATCHES]) \
+            if score >= SIMILARITY_THRESHOLD}
+    if not ranks:
+        return query.filter(false())
+    return query.filter(key.in_(ranks)).order_by(case(ranks, value=key))
+
+def suggest(query, column, key, q, limit=5):
+    """ Returns up to limit column values of query most similar to q """
+    if not q:
+        return []
+    if has_pg_trgm():
+        with similarity_threshold(SUGGESTION_THRESHOLD):
+            rows = query.order_by(None).with_entities(column).filter(column.op('%%')(q)). \
+                    order_by(func.similarity(column, q).desc(), key).limit(limit).all()
+        return [row[0] for row in rows]
+    return [value for score, _, value in _score_rows(query, column, key, q) \
+            if score >= SUGGESTION_THRESHOLD][:limit]
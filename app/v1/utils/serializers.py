@@ -0,0 +1,80 @@
+""" Serialization of categories and recipes to JSON responses shared by all views """
+
+import json
+from datetime import date
+from flask import current_app, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pylint: disable=C0103
+# pylint: disable=E1101
+
+CATEGORY_FIELDS = ['id', 'category_name', 'user_id', 'date_created', 'date_modified']
+RECIPE_FIELDS = ['id', 'recipe_name', 'ingredients', 'directions', 'category_id', \
+        'date_created', 'date_modified']
+DATE_FIELDS = ('date_created', 'date_modified')
+
+WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+def http_date(value):
+    """
+    Returns date formatted like Flask's JSON encoder does, e.g. 'Sat, 17 Oct 2026 12:55:19
+    GMT', without the time tuple conversion of werkzeug.http.http_date
+    """
+    if value is None:
+        return None
+    return '%s, %02d %s %04d %02d:%02d:%02d GMT' % (WEEKDAYS[value.weekday()], value.day, \
+            MONTHS[value.month - 1], value.year, getattr(value, 'hour', 0), \
+            getattr(value, 'minute', 0), getattr(value, 'second', 0))
+
+def serialize(row, fields):
+    """ Returns dict of fields of row, which may be a model instance or a projected tuple """
+    obj = {field: getattr(row, field) for field in fields}
+    for field in DATE_FIELDS:
+        if field in obj:
+            obj[field] = http_date(obj[field])
+    return obj
+
+def serialize_category(category):
+    """ Returns dict of category """
+    return serialize(category, CATEGORY_FIELDS)
+
+def serialize_recipe(recipe, fields=None):
+    """ Returns dict of fields of recipe, category_name is read from its loaded category """
+    fields = fields or RECIPE_FIELDS
+    obj = serialize(recipe, [field for field in fields if field != 'category_name'])
+    if 'category_name' in fields:
+        obj['category_name'] = recipe.category.category_name
+    return obj
+
+def _default(value):
+    """ Returns JSON serializable form of values the encoders do not support """
+    if isinstance(value, date):
+        return http_date(value)
+    raise TypeError('%r is not JSON serializable' % (value,))
+
+def dumps(data, pretty=False):
+    """ Returns data encoded as JSON bytes, with orjson if it is installed """
+    sort_keys = current_app.config.get('JSON_SORT_KEYS', True)
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=option)
+    if pretty:
+        return json.dumps(data, default=_default, sort_keys=sort_keys, indent=2, \
+                separators=(',', ': ')).encode('utf-8')
+    return json.dumps(data, default=_default, sort_keys=sort_keys, \
+            separators=(',', ':')).encode('utf-8')
+
+def json_response(data, status=200):
+    """ Returns JSON response of data, formatted like jsonify """
+    pretty = current_app.config.get('JSONIFY_PRETTYPRINT_REGULAR') or current_app.debug
+    return Response(dumps(data, pretty) + b'\n', status=status, \
+            mimetype=current_app.config.get('JSONIFY_MIMETYPE', 'application/json'))
@@ -0,0 +1,77 @@
+""" Bounded LRU cache of verified access tokens shared by all request threads of a worker """
+
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+class TokenCache(object):
+    """
+    Maps recently verified tokens to their payload so that repeated requests with the same
+    token skip signature verification. Entries expire with the token and are evicted on
+    logout. Revocation is still checked on every request.
+    """
+
+    def __init__(self, capacity, stats_interval=None):
+        self.capacity = capacity
+        self.stats_interval = stats_interval
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token):
+        """ Returns payload of verified unexpired token, None if token is not cached """
+        with self.lock:
+            payload = self.entries.get(token)
+            if payload is not None and payload['exp'] <= time.time():
+                del self.entries[token]
+                payload = None
+            if payload is None:
+                self.misses += 1
+            else:
+                self.entries.move_to_end(token)
+                self.hits += 1
+            lookups = self.hits + self.misses
+        if self.stats_interval and lookups % self.stats_interval == 0:
+            current_app.logger.info('Token cache: %s', self.stats())
+        return payload
+
+    def put(self, token, payload):
+        """ Add verified token, evicting least recently used token if cache is full """
+        if not self.capacity or 'exp' not in payload:
+            return
+        with self.lock:
+            self.entries[token] = payload
+            self.entries.move_to_end(token)
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, token):
+        """ Remove token from cache """
+        with self.lock:
+            self.entries.pop(token, None)
+
+    def stats(self):
+        """ Returns cache size and hit rate counters """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+def init_token_cache(app):
+    """ Attach a verified token cache to application """
+    app.extensions['token_cache'] = TokenCache(app.config.get('TOKEN_CACHE_SIZE', 10000), \
+            app.config.get('TOKEN_CACHE_STATS_INTERVAL'))
+
+def get_token_cache():
+    """ Returns verified token cache of current application """
+    return current_app.extensions['token_cache']
@@ -1,8 +1,11 @@
 """ Input data validation for category views """
 
+from app import db
 from app.v1.models.category_models import Category
 from app.v1.validators import validate_title
 
+DUPLICATE_CATEGORY_NAME = 'A category with this category name is already available.'
+
 def validate_category_name(value, user_id, category_id=None):
     """
     Returns 'Valid' if category name is valid and category with similar category name
@@ -14,11 +17,17 @@ def validate_category_name(value, user_id, category_id=None):
     elif not validate_title(value):
         return 'Please enter a valid category name.'
     else:
-        categories = Category.query.filter_by(user_id=user_id)
-        for category in categories:
-            if category.user_id == user_id and category.category_name.lower() == \
-                    value.lower():
-                if category_id and category.id == category_id:
-                    return 'Valid'
-                return 'A category with this category name is already available.'
+        query = Category.query.filter(Category.user_id == user_id, \
+                db.func.lower(Category.category_name) == value.lower())
+        if category_id:
+            query = query.filter(Category.id != category_id)
+        if db.session.query(query.exists()).scalar():
+            return DUPLICATE_CATEGORY_NAME
     return 'Valid'
+
+def is_duplicate_category_name(error):
+    """
+    Returns True if IntegrityError was raised by unique index on user's lowercase category
+    names, for categories saved concurrently with the same name
+    """
+    return 'ix_categories_user_id_lower_category_name' in str(error.orig)
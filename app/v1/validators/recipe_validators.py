@@ -1,34 +1,65 @@
 """ Input data validation for recipe views """
 
+from app import db
 from app.v1.models.recipe_models import Recipe
 from app.v1.validators import validate_title
 
+DUPLICATE_RECIPE_NAME = 'A recipe with this recipe name is already available.'
+
 def validate_recipe_name(value, category_id, recipe_id=None):
     """
     Returns 'Valid' if recipe name is valid and recipe with similar recipe name
     has not been created under specific category or is related to specific recipe id related
     to specific category
     """
+    message = validate_recipe_name_format(value)
+    if message == 'Valid':
+        query = Recipe.query.filter(Recipe.category_id == category_id, \
+                db.func.lower(Recipe.recipe_name) == value.lower())
+        if recipe_id:
+            query = query.filter(Recipe.id != recipe_id)
+        if db.session.query(query.exists()).scalar():
+            return DUPLICATE_RECIPE_NAME
+    return message
+
+def validate_recipe_name_format(value):
+    """
+    Returns 'Valid' if recipe name is not empty and contains only allowed characters,
+    without checking for recipes with a similar name
+    """
     if not value:
         return 'Please enter recipe name.'
-    elif not validate_title(value):
+    elif not validate_title(value) or len(value) > 100:
         return 'Please enter a valid recipe name.'
-    else:
-        recipes = Recipe.query.filter_by(category_id=category_id)
-        for recipe in recipes:
-            if recipe.category_id == category_id and recipe.recipe_name.lower() == \
-                    value.lower():
-                if recipe_id and recipe.id == recipe_id:
-                    return 'Valid'
-                return 'A recipe with this recipe name is already available.'
     return 'Valid'
 
+def find_duplicate_recipe_names(names, category_id):
+    """
+    Returns lowercase names of recipes of category that match any of names, checked
+    with a single query
+    """
+    lowered = {name.lower() for name in names}
+    if not lowered:
+        return set()
+    rows = db.session.query(db.func.lower(Recipe.recipe_name)).filter( \
+            Recipe.category_id == category_id, db.func.lower(Recipe.recipe_name).in_(lowered))
+    return {row[0] for row in rows}
+
+def is_duplicate_recipe_name(error):
+    """
+    Returns True if IntegrityError was raised by unique index on lowercase recipe names of
+    category, for recipes saved concurrently with the same name
+    """
+    return 'ix_recipes_category_id_lower_recipe_name' in str(error.orig)
+
 def validate_ingredients(value):
     """
     Returns 'Valid' if ingredient field is not empty
     """
     if not value:
         return 'Please enter ingredients.'
+    elif len(value) > 800:
+        return 'Ingredients must not be longer than 800 characters.'
     return 'Valid'
 
 def validate_directions(value):
@@ -37,4 +68,6 @@ def validate_directions(value):
     """
     if not value:
         return 'Please enter directions.'
+    elif len(value) > 2000:
+        return 'Directions must not be longer than 2000 characters.'
     return 'Valid'
@@ -11,7 +11,9 @@ from app.v1.validators.auth_validators import validate_username, validate_user_e
         validate_password, validate_confirm_password
 from app.v1.views import auth_blueprint
 from app.v1.utils.decorators import authenticate
-from app.v1.utils.mailer import send_mail
+from app.v1.utils.mail_queue import queue_mail
+from app.v1.utils.revocation import get_revocation_filter
+from app.v1.utils.token_cache import get_token_cache
 
 # pylint: disable=C0103
 # pylint: disable=W0703
@@ -132,6 +134,9 @@ class LoginView(Resource):
         try:
             user = User.query.filter_by(username=args.username).first()
             if user and user.check_password(args.password):
+                if user.password_needs_rehash():
+                    user.password = user.hash_password(password=args.password)
+                    user.save()
                 access_token = user.encode_token(user.id)
                 if access_token:
                     response = jsonify({
@@ -193,11 +198,11 @@ class ResetPasswordView(Resource):
                         string.digits
                 new_password = ''.join(random.choice(chars) for i in range(8))
                 user.password = user.hash_password(password=new_password)
-                user.save()
                 mail_content = 'Hi %s,\n\nYour password has been reset to %s. \
 Please change it after login.\n\nBest regards,\nYummy Recipes Inc.' \
 %(user.username, new_password)
-                send_mail(user, "Yummy Recipes Password Reset", mail_content)
+                queue_mail(user, "Yummy Recipes Password Reset", mail_content)
+                user.save()
                 response = jsonify({'message': 'Your password has been reset.'})
                 response.status_code = 200
             else:
@@ -241,6 +246,8 @@ class ChangePasswordView(Resource):
             description: Password changed successfully
           400:
             description: Data validation failed
+          401:
+            description: User authentication failed
           500:
             description: Database could not be accessed or email could not be sent
         """
@@ -256,6 +263,8 @@ class ChangePasswordView(Resource):
             return jsonify(messages), 400
 
         try:
+            if user.load() is None:
+                return jsonify({'message': 'Sorry, user could not be found.'}), 401
             user.password = user.hash_password(password=args.new_password)
             user.save()
             response = jsonify({'message': 'Your password has been changed.'})
@@ -287,8 +296,10 @@ class LogoutView(Resource):
         """
 
         try:
-            revoked_token = RevokedToken(token=access_token)
+            revoked_token = RevokedToken.from_token(access_token)
             revoked_token.save()
+            get_revocation_filter().add(revoked_token.jti)
+            get_token_cache().discard(access_token)
             response = jsonify({'message': 'Your have been logged out.'})
             response.status_code = 200
         except exc.SQLAlchemyError as error:
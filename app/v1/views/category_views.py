@@ -1,13 +1,20 @@
 """ Category view for creating, viewing, updating and deleting categories """
 
-from flask import jsonify, request, url_for
+from flask import current_app, request, url_for, Response, stream_with_context
 from flask_restful import Resource, reqparse
 from sqlalchemy import exc
+from app import db
 from app.v1.models.category_models import Category
+from app.v1.models.recipe_models import Recipe
 from app.v1.validators import data_validator
-from app.v1.validators.category_validators import validate_category_name
+from app.v1.validators.category_validators import validate_category_name, \
+        is_duplicate_category_name, DUPLICATE_CATEGORY_NAME
 from app.v1.utils.decorators import authenticate
+from app.v1.utils.etags import list_etag, make_etag, not_modified
 from app.v1.utils.paginator import get_paginated_results
+from app.v1.utils.search import fuzzy_search, suggest
+from app.v1.utils.serializers import dumps, json_response, serialize_category, \
+        serialize_recipe
 
 # pylint: disable=C0103
 # pylint: disable=W0703
@@ -55,21 +62,20 @@ class CategoryView(Resource):
         messages['category_name_message'] = validate_category_name(args.category_name.strip(), user.id)
 
         if not data_validator(messages):
-            return jsonify(messages), 400
+            return json_response(messages), 400
 
         try:
             category = Category(category_name=args.category_name, user_id=user.id)
             category.save()
-            response = jsonify({
-                'id': category.id,
-                'category_name': category.category_name,
-                'user_id': category.user_id,
-                'date_created': category.date_created,
-                'date_modified': category.date_modified
-            })
+            response = json_response(serialize_category(category))
             response.status_code = 201
+        except exc.IntegrityError as error:
+            db.session.rollback()
+            if is_duplicate_category_name(error):
+                return json_response({'category_name_message': DUPLICATE_CATEGORY_NAME}), 400
+            return json_response({'message': str(error)}), 500
         except exc.SQLAlchemyError as error:
-            return jsonify({'message': str(error)}), 500
+            return json_response({'message': str(error)}), 500
         return response
 
     def get(self, access_token, user):
@@ -87,9 +93,17 @@ class CategoryView(Resource):
           - in: query
             name: limit
             description: Number of categories to display per page
+          - in: query
+            name: after
+            description: Cursor of last category seen, pages by cursor instead of page number
+          - in: query
+            name: before
+            description: Cursor of first category seen, pages back by cursor
         responses:
           200:
             description: Categories retrieved successfully
+          304:
+            description: Not modified since response with ETag in If-None-Match header
           400:
             description: Non-integer page and limit values submitted
           500:
@@ -97,20 +111,16 @@ class CategoryView(Resource):
         """
 
         try:
-            categories = Category.query.filter_by(user_id=user.id).all()
-            paginated = get_paginated_results(request, categories, url_for('category_view') + '?')
+            categories = Category.query.filter_by(user_id=user.id).order_by(Category.id)
+            etag, count = list_etag(categories, Category)
+            response = not_modified(etag)
+            if response is not None:
+                return response
+            paginated = get_paginated_results(request, categories, url_for('category_view') + '?', \
+                    key=Category.id, count=count)
             if paginated['is_good_query']:
-                results = []
-                for category in paginated['results']:
-                    obj = {
-                        'id': category.id,
-                        'category_name': category.category_name,
-                        'user_id': category.user_id,
-                        'date_created': category.date_created,
-                        'date_modified': category.date_modified
-                    }
-                    results.append(obj)
-                response = jsonify({
+                results = [serialize_category(category) for category in paginated['results']]
+                response = json_response({
                     'results': results,
                     'previous_link': paginated['previous_link'],
                     'next_link': paginated['next_link'],
@@ -118,11 +128,12 @@ class CategoryView(Resource):
                     'pages': paginated['pages']
                     })
                 response.status_code = 200
+                response.set_etag(etag)
             else:
-                response = jsonify({'message': 'Please enter valid page and limit values.'})
+                response = json_response({'message': 'Please enter valid page and limit values.'})
                 response.status_code = 400
         except exc.SQLAlchemyError as error:
-            return jsonify({'message': str(error)}), 500
+            return json_response({'message': str(error)}), 500
         return response
 
 class CategorySpecificView(Resource):
@@ -150,6 +161,8 @@ class CategorySpecificView(Resource):
         responses:
           200:
             description: Category retrieved successfully
+          304:
+            description: Not modified since response with ETag in If-None-Match header
           404:
             description: Category with category id could not be found
           500:
@@ -159,19 +172,18 @@ class CategorySpecificView(Resource):
         try:
             category = Category.query.filter_by(id=category_id, user_id=user.id).first()
             if category:
-                response = jsonify({
-                    'id': category.id,
-                    'category_name': category.category_name,
-                    'user_id': category.user_id,
-                    'date_created': category.date_created,
-                    'date_modified': category.date_modified
-                })
-                response.status_code = 200
+                etag = make_etag(category.id, category.date_modified)
+                response = not_modified(etag)
+                if response is None:
+                    response = json_response(serialize_category(category))
+                    response.status_code = 200
+                    response.set_etag(etag)
             else:
-                response = jsonify({'message': 'Category with category id could not be found.'})
+                response = json_response({'message': \
+                        'Category with category id could not be found.'})
                 response.status_code = 404
         except exc.SQLAlchemyError as error:
-            return jsonify({'message': str(error)}), 500
+            return json_response({'message': str(error)}), 500
         return response
 
     def put(self, access_token, user, category_id):
@@ -214,26 +226,26 @@ class CategorySpecificView(Resource):
                 category_id=category_id)
 
         if not data_validator(messages):
-            return jsonify(messages), 400
+            return json_response(messages), 400
 
         try:
-            category = Category.query.filter_by(id=category_id, user_id=user.id).first()
+            category = Category.update_returning(db.and_(Category.id == category_id, \
+                    Category.user_id == user.id), category_name=args.category_name)
             if category:
-                category.category_name = args.category_name
-                category.save()
-                response = jsonify({
-                    'id': category.id,
-                    'category_name': category.category_name,
-                    'user_id': category.user_id,
-                    'date_created': category.date_created,
-                    'date_modified': category.date_modified
-                })
+                db.session.commit()
+                response = json_response(serialize_category(category))
                 response.status_code = 200
             else:
-                response = jsonify({'message': 'Category with category id could not be found.'})
+                response = json_response({'message': \
+                        'Category with category id could not be found.'})
                 response.status_code = 404
+        except exc.IntegrityError as error:
+            db.session.rollback()
+            if is_duplicate_category_name(error):
+                return json_response({'category_name_message': DUPLICATE_CATEGORY_NAME}), 400
+            return json_response({'message': str(error)}), 500
         except exc.SQLAlchemyError as error:
-            return jsonify({'message': str(error)}), 500
+            return json_response({'message': str(error)}), 500
         return response
 
     def delete(self, access_token, user, category_id):
@@ -260,17 +272,21 @@ class CategorySpecificView(Resource):
         """
 
         try:
-            category = Category.query.filter_by(id=category_id, user_id=user.id).first()
+            if db.engine.dialect.name != 'postgresql':
+                Recipe.delete_in_category(user.id, category_id)
+            category = Category.delete_returning(db.and_(Category.id == category_id, \
+                    Category.user_id == user.id))
             if category:
-                category.delete()
-                response = jsonify({'message': "Category {} has been deleted". \
+                db.session.commit()
+                response = json_response({'message': "Category {} has been deleted". \
                         format(category.category_name)})
                 response.status_code = 200
             else:
-                response = jsonify({'message': 'Category with category id could not be found.'})
+                response = json_response({'message': \
+                        'Category with category id could not be found.'})
                 response.status_code = 404
         except exc.SQLAlchemyError as error:
-            return jsonify({'message': str(error)}), 500
+            return json_response({'message': str(error)}), 500
         return response
 
 class CategorySearchView(Resource):
@@ -290,15 +306,24 @@ class CategorySearchView(Resource):
           - in: query
             name: q
             description: Category name to search
+          - in: query
+            name: mode
+            description: Set to fuzzy to match similar category names, most similar first
           - in: query
             name: page
             description: Page number to display
           - in: query
             name: limit
             description: Number of categories to display per page
+          - in: query
+            name: after
+            description: Cursor of last category seen, pages by cursor instead of page number
+          - in: query
+            name: before
+            description: Cursor of first category seen, pages back by cursor
         responses:
           200:
-            description: Categories retrieved successfully
+            description: Categories retrieved successfully, with suggestions if none matched
           400:
             description: Non-integer page and limit values submitted
           500:
@@ -311,35 +336,77 @@ class CategorySearchView(Resource):
             q = ''
 
         try:
-            categories = Category.query.filter(Category.category_name.ilike('%' + q + \
-                    '%')).filter_by(user_id=user.id).all()
-            paginated = get_paginated_results(request, categories, url_for('category_search_view') + '?q=' + q + '&')
+            user_categories = Category.query.filter_by(user_id=user.id)
+            if request.values.get('mode') == 'fuzzy':
+                categories = fuzzy_search(user_categories, Category.category_name, \
+                        Category.id, q)
+                paginated = get_paginated_results(request, categories, \
+                        url_for('category_search_view') + '?q=' + q + '&mode=fuzzy&')
+            else:
+                categories = user_categories.filter(Category.category_name.ilike('%' + q + \
+                        '%')).order_by(Category.id)
+                paginated = get_paginated_results(request, categories, \
+                        url_for('category_search_view') + '?q=' + q + '&', key=Category.id)
             if paginated['is_good_query']:
-                results = []
-                for category in paginated['results']:
-                    obj = {
-                        'id': category.id,
-                        'category_name': category.category_name,
-                        'user_id': category.user_id,
-                        'date_created': category.date_created,
-                        'date_modified': category.date_modified
-                    }
-                    results.append(obj)
-                response = jsonify({
+                results = [serialize_category(category) for category in paginated['results']]
+                data = {
                     'results': results,
                     'previous_link': paginated['previous_link'],
                     'next_link': paginated['next_link'],
                     'page': paginated['page'],
                     'pages': paginated['pages']
-                    })
+                    }
+                if not paginated['pages'] and paginated['page'] == 1:
+                    data['suggestions'] = suggest(user_categories, Category.category_name, \
+                            Category.id, q)
+                response = json_response(data)
                 response.status_code = 200
             else:
-                response = jsonify({'message': 'Please enter valid page and limit values.'})
+                response = json_response({'message': 'Please enter valid page and limit values.'})
                 response.status_code = 400
         except exc.SQLAlchemyError as error:
-            return jsonify({'message': str(error)}), 500
+            return json_response({'message': str(error)}), 500
         return response
 
+class CategoryExportView(Resource):
+    """ Allows for exporting of all categories and recipes of a user. """
+
+    method_decorators = [authenticate]
+
+    def get(self, access_token, user):
+        """
+        Process GET request
+        ---
+        tags:
+          - Category
+        security:
+          - Bearer: []
+        produces:
+          - application/x-ndjson
+        responses:
+          200:
+            description: One JSON object per line, each category followed by its recipes
+        """
+
+        user_id = user.id
+        batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 500)
+
+        def generate():
+            """ Yield categories and recipes read from a server-side cursor in batches """
+            rows = db.session.query(Category, Recipe).outerjoin(Recipe, \
+                    Recipe.category_id == Category.id).filter(Category.user_id == user_id). \
+                    order_by(Category.id, Recipe.id).yield_per(batch_size)
+            category_id = None
+            for category, recipe in rows:
+                if category.id != category_id:
+                    category_id = category.id
+                    yield dumps(dict(serialize_category(category), type='category')) + b'\n'
+                if recipe is not None:
+                    yield dumps(dict(serialize_recipe(recipe), type='recipe')) + b'\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 category_view = CategoryView.as_view('category_view')
 category_specific_view = CategorySpecificView.as_view('category_specific_view')
 category_search_view = CategorySearchView.as_view('category_search_view')
+category_export_view = CategoryExportView.as_view('category_export_view')
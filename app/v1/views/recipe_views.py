@@ -1,15 +1,25 @@
 """ Recipe view for creating, viewing, updating and deleting recipes """
 
-from flask import jsonify, request, url_for
+import json
+from flask import current_app, request, url_for
 from flask_restful import Resource, reqparse
-from sqlalchemy import exc
+from sqlalchemy import exc, func
+from sqlalchemy.orm import contains_eager
+from app import db
 from app.v1.models.category_models import Category
-from app.v1.models.recipe_models import Recipe
+from app.v1.models.recipe_models import Recipe, RecipeIngredient
 from app.v1.validators import data_validator
 from app.v1.validators.recipe_validators import validate_recipe_name, validate_ingredients, \
-        validate_directions
+        validate_directions, is_duplicate_recipe_name, DUPLICATE_RECIPE_NAME, \
+        validate_recipe_name_format, find_duplicate_recipe_names
 from app.v1.utils.decorators import authenticate
+from app.v1.utils.etags import list_etag, make_etag, not_modified
+from app.v1.utils.ingredients import parse_ingredient_query
 from app.v1.utils.paginator import get_paginated_results
+from app.v1.utils.projection import RECIPE_SUMMARY_FIELDS, get_fields, get_field_params, \
+        project
+from app.v1.utils.search import fuzzy_search, rank_recipes, suggest
+from app.v1.utils.serializers import json_response, serialize_recipe, RECIPE_FIELDS
 
 # pylint: disable=C0103
 # pylint: disable=W0703
@@ -84,29 +94,27 @@ ingredients with the mixing spoon. 3) Pour into the glass, filtering the ice wit
         messages['directions_message'] = validate_directions(args.directions)
 
         if not data_validator(messages):
-            return jsonify(messages), 400
+            return json_response(messages), 400
 
         try:
             category = Category.query.filter_by(id=category_id, user_id=user.id).first()
             if category:
                 recipe = Recipe(recipe_name=args.recipe_name, ingredients=args.ingredients, \
                         directions=args.directions, category_id=category_id)
+                recipe.index_ingredients()
                 recipe.save()
-                response = jsonify({
-                    'id': recipe.id,
-                    'recipe_name': recipe.recipe_name,
-                    'ingredients': recipe.ingredients,
-                    'directions': recipe.directions,
-                    'category_id': recipe.category_id,
-                    'date_created': recipe.date_created,
-                    'date_modified': recipe.date_modified
-                })
+                response = json_response(serialize_recipe(recipe))
                 response.status_code = 201
             else:
-                response = jsonify({'message': 'Sorry, recipe category could not be found.'})
+                response = json_response({'message': 'Sorry, recipe category could not be found.'})
                 response.status_code = 404
+        except exc.IntegrityError as error:
+            db.session.rollback()
+            if is_duplicate_recipe_name(error):
+                return json_response({'recipe_name_message': DUPLICATE_RECIPE_NAME}), 400
+            return json_response({'message': str(error)}), 500
         except exc.SQLAlchemyError as error:
-            return jsonify({'message': str(error)}), 500
+            return json_response({'message': str(error)}), 500
         return response
 
     def get(self, access_token, user, category_id):
@@ -129,36 +137,50 @@ ingredients with the mixing spoon. 3) Pour into the glass, filtering the ice wit
           - in: query
             name: limit
             description: Number of recipes to display per page
+          - in: query
+            name: fields
+            description: Comma separated recipe fields to return, e.g. id,recipe_name
+          - in: query
+            name: view
+            description: Set to summary to leave out ingredients and directions
+          - in: query
+            name: after
+            description: Cursor of last recipe seen, pages by cursor instead of page number
+          - in: query
+            name: before
+            description: Cursor of first recipe seen, pages back by cursor
         responses:
           200:
             description: Categories retrieved successfully
+          304:
+            description: Not modified since response with ETag in If-None-Match header
           400:
-            description: Non-integer page and limit values submitted
+            description: Non-integer page and limit values or invalid fields submitted
           404:
             description: Invalid recipe category id
           500:
             description: Database could not be accessed
         """
 
+        fields = get_fields(request)
+        if fields is None:
+            return json_response({'message': 'Please enter valid fields.'}), 400
+
         try:
             category = Category.query.filter_by(id=category_id, user_id=user.id).first()
             if category:
-                recipes = Recipe.query.filter_by(category_id=category.id).all()
-                paginated = get_paginated_results(request, recipes, url_for('recipe_view', category_id=category_id) + '?')
+                recipes = project(Recipe.query.filter_by(category_id=category.id), fields). \
+                        order_by(Recipe.id)
+                etag, count = list_etag(recipes, Recipe, category.category_name)
+                response = not_modified(etag)
+                if response is not None:
+                    return response
+                paginated = get_paginated_results(request, recipes, url_for('recipe_view', \
+                        category_id=category_id) + '?' + get_field_params(request), key=Recipe.id, \
+                        count=count)
                 if paginated['is_good_query']:
-                    results = []
-                    for recipe in paginated['results']:
-                        obj = {
-                            'id': recipe.id,
-                            'recipe_name': recipe.recipe_name,
-                            'ingredients': recipe.ingredients,
-                            'directions': recipe.directions,
-                            'category_id': recipe.category_id,
-                            'date_created': recipe.date_created,
-                            'date_modified': recipe.date_modified
-                        }
-                        results.append(obj)
-                    response = jsonify({
+                    results = [serialize_recipe(recipe, fields) for recipe in paginated['results']]
+                    response = json_response({
                         'category_name': category.category_name,
                         'results': results,
                         'previous_link': paginated['previous_link'],
@@ -167,14 +189,16 @@ ingredients with the mixing spoon. 3) Pour into the glass, filtering the ice wit
                         'pages': paginated['pages']
                         })
                     response.status_code = 200
+                    response.set_etag(etag)
                 else:
-                    response = jsonify({'message': 'Please enter valid page and limit values.'})
+                    response = json_response({'message': \
+                            'Please enter valid page and limit values.'})
                     response.status_code = 400
             else:
-                response = jsonify({'message': 'Sorry, recipe category could not be found.'})
+                response = json_response({'message': 'Sorry, recipe category could not be found.'})
                 response.status_code = 404
         except exc.SQLAlchemyError as error:
-            return jsonify({'message': str(error)}), 500
+            return json_response({'message': str(error)}), 500
         return response
 
 class RecipeSpecificView(Resource):
@@ -209,6 +233,8 @@ class RecipeSpecificView(Resource):
         responses:
           200:
             description: Recipe retrieved successfully
+          304:
+            description: Not modified since response with ETag in If-None-Match header
           404:
             description: Category/recipe with id could not be found
           500:
@@ -216,28 +242,23 @@ class RecipeSpecificView(Resource):
         """
 
         try:
-            category = Category.query.filter_by(id=category_id, user_id=user.id).first()
+            category, recipe = Recipe.find_for_user(user.id, category_id, recipe_id)
             if category:
-                recipe = Recipe.query.filter_by(id=recipe_id, category_id=category.id).first()
                 if recipe:
-                    response = jsonify({
-                        'id': recipe.id,
-                        'recipe_name': recipe.recipe_name,
-                        'ingredients': recipe.ingredients,
-                        'directions': recipe.directions,
-                        'category_id': recipe.category_id,
-                        'date_created': recipe.date_created,
-                        'date_modified': recipe.date_modified
-                    })
-                    response.status_code = 200
+                    etag = make_etag(recipe.id, recipe.date_modified)
+                    response = not_modified(etag)
+                    if response is None:
+                        response = json_response(serialize_recipe(recipe))
+                        response.status_code = 200
+                        response.set_etag(etag)
                 else:
-                    response = jsonify({'message': 'Sorry, recipe could not be found.'})
+                    response = json_response({'message': 'Sorry, recipe could not be found.'})
                     response.status_code = 404
             else:
-                response = jsonify({'message': 'Sorry, recipe category could not be found.'})
+                response = json_response({'message': 'Sorry, recipe category could not be found.'})
                 response.status_code = 404
         except exc.SQLAlchemyError as error:
-            return jsonify({'message': str(error)}), 500
+            return json_response({'message': str(error)}), 500
         return response
 
     def put(self, access_token, user, category_id, recipe_id):
@@ -300,35 +321,25 @@ ingredients with the mixing spoon. 3) Pour into the glass, filtering the ice wit
         messages['directions_message'] = validate_directions(args.directions)
 
         if not data_validator(messages):
-            return jsonify(messages), 400
+            return json_response(messages), 400
 
         try:
-            category = Category.query.filter_by(id=category_id, user_id=user.id).first()
-            if category:
-                recipe = Recipe.query.filter_by(id=recipe_id, category_id=category.id).first()
-                if recipe:
-                    recipe.recipe_name = args.recipe_name
-                    recipe.ingredients = args.ingredients
-                    recipe.directions = args.directions
-                    recipe.save()
-                    response = jsonify({
-                        'id': recipe.id,
-                        'recipe_name': recipe.recipe_name,
-                        'ingredients': recipe.ingredients,
-                        'directions': recipe.directions,
-                        'category_id': recipe.category_id,
-                        'date_created': recipe.date_created,
-                        'date_modified': recipe.date_modified
-                    })
-                    response.status_code = 200
-                else:
-                    response = jsonify({'message': 'Sorry, recipe could not be found.'})
-                    response.status_code = 404
+            recipe = Recipe.update_for_user(user.id, category_id, recipe_id, \
+                    recipe_name=args.recipe_name, ingredients=args.ingredients, \
+                    directions=args.directions)
+            if recipe:
+                db.session.commit()
+                response = json_response(serialize_recipe(recipe))
+                response.status_code = 200
             else:
-                response = jsonify({'message': 'Sorry, recipe category could not be found.'})
-                response.status_code = 404
+                response = recipe_not_found(user.id, category_id)
+        except exc.IntegrityError as error:
+            db.session.rollback()
+            if is_duplicate_recipe_name(error):
+                return json_response({'recipe_name_message': DUPLICATE_RECIPE_NAME}), 400
+            return json_response({'message': str(error)}), 500
         except exc.SQLAlchemyError as error:
-            return jsonify({'message': str(error)}), 500
+            return json_response({'message': str(error)}), 500
         return response
 
     def delete(self, access_token, user, category_id, recipe_id):
@@ -360,22 +371,16 @@ ingredients with the mixing spoon. 3) Pour into the glass, filtering the ice wit
         """
 
         try:
-            category = Category.query.filter_by(id=category_id, user_id=user.id).first()
-            if category:
-                recipe = Recipe.query.filter_by(id=recipe_id, category_id=category.id).first()
-                if recipe:
-                    recipe.delete()
-                    response = jsonify({'message': "Recipe {} has been deleted.". \
-                            format(recipe.recipe_name)})
-                    response.status_code = 200
-                else:
-                    response = jsonify({'message': 'Sorry, recipe could not be found.'})
-                    response.status_code = 404
+            recipe = Recipe.delete_for_user(user.id, category_id, recipe_id)
+            if recipe:
+                db.session.commit()
+                response = json_response({'message': "Recipe {} has been deleted.". \
+                        format(recipe.recipe_name)})
+                response.status_code = 200
             else:
-                response = jsonify({'message': 'Sorry, recipe category could not be found.'})
-                response.status_code = 404
+                response = recipe_not_found(user.id, category_id)
         except exc.SQLAlchemyError as error:
-            return jsonify({'message': str(error)}), 500
+            return json_response({'message': str(error)}), 500
         return response
 
 class RecipeSearchView(Resource):
@@ -400,17 +405,33 @@ class RecipeSearchView(Resource):
           - in: query
             name: q
             description: Recipe name to search
+          - in: query
+            name: mode
+            description: Set to rank to search names, ingredients and directions, best matches
+                         first, or to fuzzy to match similar recipe names
           - in: query
             name: start
             description: id to start category results pagination
           - in: query
             name: limit
             description: Number of recipes to display per page
+          - in: query
+            name: fields
+            description: Comma separated recipe fields to return, e.g. id,recipe_name
+          - in: query
+            name: view
+            description: Set to summary to leave out ingredients and directions
+          - in: query
+            name: after
+            description: Cursor of last recipe seen, pages by cursor instead of page number
+          - in: query
+            name: before
+            description: Cursor of first recipe seen, pages back by cursor
         responses:
           200:
-            description: Recipes retrieved successfully
+            description: Recipes retrieved successfully, with suggestions if none matched
           400:
-            description: Non-integer page and limit values submitted
+            description: Non-integer page and limit values or invalid fields submitted
           404:
             description: Category with category id could not be found
           500:
@@ -421,45 +442,382 @@ class RecipeSearchView(Resource):
             q = request.values.get('q')
         else:
             q = ''
+        fields = get_fields(request)
+        if fields is None:
+            return json_response({'message': 'Please enter valid fields.'}), 400
 
         try:
             category = Category.query.filter_by(id=category_id, user_id=user.id).first()
             if category:
-                recipes = Recipe.query.filter(Recipe.recipe_name.ilike('%' + q + \
-                        '%')).filter_by(category_id=category_id).all()
-                paginated = get_paginated_results(request, recipes, url_for('recipe_search_view', \
-                        category_id=category_id) + '?q=' + q + '&')
+                category_recipes = project(Recipe.query.filter_by(category_id=category_id), fields)
+                if request.values.get('mode') in ('rank', 'fuzzy'):
+                    mode = request.values.get('mode')
+                    if mode == 'rank':
+                        recipes = rank_recipes(category_recipes, q)
+                    else:
+                        recipes = fuzzy_search(category_recipes, Recipe.recipe_name, \
+                                Recipe.id, q)
+                    paginated = get_paginated_results(request, recipes, url_for( \
+                            'recipe_search_view', category_id=category_id) + '?q=' + q + \
+                            '&mode=' + mode + '&' + get_field_params(request))
+                else:
+                    recipes = category_recipes.filter(Recipe.recipe_name.ilike('%' + q + \
+                            '%')).order_by(Recipe.id)
+                    paginated = get_paginated_results(request, recipes, url_for( \
+                            'recipe_search_view', category_id=category_id) + '?q=' + q + '&' + \
+                            get_field_params(request), key=Recipe.id)
                 if paginated['is_good_query']:
-                    results = []
-                    for recipe in paginated['results']:
-                        obj = {
-                            'id': recipe.id,
-                            'recipe_name': recipe.recipe_name,
-                            'ingredients': recipe.ingredients,
-                            'directions': recipe.directions,
-                            'category_id': recipe.category_id,
-                            'date_created': recipe.date_created,
-                            'date_modified': recipe.date_modified
-                        }
-                        results.append(obj)
-                    response = jsonify({
+                    results = [serialize_recipe(recipe, fields) for recipe in paginated['results']]
+                    data = {
                         'results': results,
                         'previous_link': paginated['previous_link'],
                         'next_link': paginated['next_link'],
                         'page': paginated['page'],
                         'pages': paginated['pages']
-                        })
+                        }
+                    if not paginated['pages'] and paginated['page'] == 1:
+                        data['suggestions'] = suggest(category_recipes, Recipe.recipe_name, \
+                                Recipe.id, q)
+                    response = json_response(data)
                     response.status_code = 200
                 else:
-                    response = jsonify({'message': 'Please enter valid page and limit values.'})
+                    response = json_response({'message': \
+                            'Please enter valid page and limit values.'})
                     response.status_code = 400
             else:
-                response = jsonify({'message': 'Sorry, recipe category could not be found.'})
+                response = json_response({'message': 'Sorry, recipe category could not be found.'})
                 response.status_code = 404
         except exc.SQLAlchemyError as error:
-            return jsonify({'message': str(error)}), 500
+            return json_response({'message': str(error)}), 500
+        return response
+
+class UserRecipeSearchView(Resource):
+    """Allows for searching of recipes in all categories of a user."""
+
+    method_decorators = [authenticate]
+
+    def get(self, access_token, user):
+        """
+        Process GET request
+        ---
+        tags:
+          - Recipe
+        security:
+          - Bearer: []
+        parameters:
+          - in: query
+            name: q
+            description: Recipe name to search
+          - in: query
+            name: mode
+            description: Set to rank to search names, ingredients and directions, best matches
+                         first, or to fuzzy to match similar recipe names
+          - in: query
+            name: page
+            description: Page number to display
+          - in: query
+            name: limit
+            description: Number of recipes to display per page
+          - in: query
+            name: fields
+            description: Comma separated recipe fields to return, e.g. id,recipe_name
+          - in: query
+            name: view
+            description: Set to summary to leave out ingredients and directions
+          - in: query
+            name: after
+            description: Cursor of last recipe seen, pages by cursor instead of page number
+          - in: query
+            name: before
+            description: Cursor of first recipe seen, pages back by cursor
+        responses:
+          200:
+            description: Recipes retrieved successfully, with suggestions if none matched
+          400:
+            description: Non-integer page and limit values or invalid fields submitted
+          500:
+            description: Database could not be accessed
+        """
+
+        if request.values.get('q'):
+            q = request.values.get('q')
+        else:
+            q = ''
+        fields = get_fields(request, RECIPE_FIELDS + ['category_name'], \
+                RECIPE_SUMMARY_FIELDS + ['category_name'])
+        if fields is None:
+            return json_response({'message': 'Please enter valid fields.'}), 400
+
+        try:
+            user_recipes = project(Recipe.query.join(Recipe.category).filter( \
+                    Category.user_id == user.id).options(contains_eager(Recipe.category)), fields)
+            if request.values.get('mode') in ('rank', 'fuzzy'):
+                mode = request.values.get('mode')
+                if mode == 'rank':
+                    recipes = rank_recipes(user_recipes, q)
+                else:
+                    recipes = fuzzy_search(user_recipes, Recipe.recipe_name, Recipe.id, q)
+                paginated = get_paginated_results(request, recipes, url_for( \
+                        'user_recipe_search_view') + '?q=' + q + '&mode=' + mode + '&' + \
+                        get_field_params(request))
+            else:
+                recipes = user_recipes.filter(Recipe.recipe_name.ilike('%' + q + \
+                        '%')).order_by(Recipe.id)
+                paginated = get_paginated_results(request, recipes, url_for( \
+                        'user_recipe_search_view') + '?q=' + q + '&' + get_field_params(request), \
+                        key=Recipe.id)
+            if paginated['is_good_query']:
+                results = [serialize_recipe(recipe, fields) for recipe in paginated['results']]
+                data = {
+                    'results': results,
+                    'previous_link': paginated['previous_link'],
+                    'next_link': paginated['next_link'],
+                    'page': paginated['page'],
+                    'pages': paginated['pages']
+                    }
+                if not paginated['pages'] and paginated['page'] == 1:
+                    data['suggestions'] = suggest(user_recipes, Recipe.recipe_name, \
+                            Recipe.id, q)
+                response = json_response(data)
+                response.status_code = 200
+            else:
+                response = json_response({'message': 'Please enter valid page and limit values.'})
+                response.status_code = 400
+        except exc.SQLAlchemyError as error:
+            return json_response({'message': str(error)}), 500
+        return response
+
+class RecipeIngredientSearchView(Resource):
+    """Allows for searching of recipes in all categories of a user by ingredients."""
+
+    method_decorators = [authenticate]
+
+    def get(self, access_token, user):
+        """
+        Process GET request
+        ---
+        tags:
+          - Recipe
+        security:
+          - Bearer: []
+        parameters:
+          - in: query
+            name: q
+            required: true
+            description: Comma separated ingredients to search, e.g. cinnamon, brown sugar.
+                         Each ingredient is matched as a whole, brown sugar does not match
+                         brown rice
+          - in: query
+            name: match
+            description: Set to any to find recipes containing any of the ingredients instead
+                         of all of them
+          - in: query
+            name: page
+            description: Page number to display
+          - in: query
+            name: limit
+            description: Number of recipes to display per page
+          - in: query
+            name: fields
+            description: Comma separated recipe fields to return, e.g. id,recipe_name
+          - in: query
+            name: view
+            description: Set to summary to leave out ingredients and directions
+          - in: query
+            name: after
+            description: Cursor of last recipe seen, pages by cursor instead of page number
+          - in: query
+            name: before
+            description: Cursor of first recipe seen, pages back by cursor
+        responses:
+          200:
+            description: Recipes retrieved successfully
+          400:
+            description: No ingredients, invalid match, page, limit or fields submitted
+          500:
+            description: Database could not be accessed
+        """
+
+        q = request.values.get('q', '')
+        match = request.values.get('match', 'all')
+        terms = parse_ingredient_query(q)
+        fields = get_fields(request, RECIPE_FIELDS + ['category_name'], \
+                RECIPE_SUMMARY_FIELDS + ['category_name'])
+        if not terms or match not in ('all', 'any'):
+            return json_response({'message': 'Please enter ingredients to search and a valid ' \
+                    'match value.'}), 400
+        if fields is None:
+            return json_response({'message': 'Please enter valid fields.'}), 400
+
+        try:
+            matching = db.session.query(RecipeIngredient.recipe_id). \
+                    filter(RecipeIngredient.term.in_(terms))
+            if match == 'all':
+                matching = matching.group_by(RecipeIngredient.recipe_id). \
+                        having(func.count(RecipeIngredient.term) == len(terms))
+            recipes = project(Recipe.query.join(Recipe.category).filter( \
+                    Category.user_id == user.id, Recipe.id.in_(matching.subquery())). \
+                    options(contains_eager(Recipe.category)), fields).order_by(Recipe.id)
+            paginated = get_paginated_results(request, recipes, url_for( \
+                    'recipe_ingredient_search_view') + '?q=' + q + '&match=' + match + '&' + \
+                    get_field_params(request), key=Recipe.id)
+            if paginated['is_good_query']:
+                results = [serialize_recipe(recipe, fields) for recipe in paginated['results']]
+                response = json_response({
+                    'results': results,
+                    'previous_link': paginated['previous_link'],
+                    'next_link': paginated['next_link'],
+                    'page': paginated['page'],
+                    'pages': paginated['pages']
+                    })
+                response.status_code = 200
+            else:
+                response = json_response({'message': 'Please enter valid page and limit values.'})
+                response.status_code = 400
+        except exc.SQLAlchemyError as error:
+            return json_response({'message': str(error)}), 500
+        return response
+
+class RecipeBulkView(Resource):
+    """Allows for importing of many recipes into a recipe category at once."""
+
+    method_decorators = [authenticate]
+
+    def post(self, access_token, user, category_id):
+        """
+        Process POST request
+        ---
+        tags:
+          - Recipe
+        security:
+          - Bearer: []
+        consumes:
+          - application/json
+          - application/x-ndjson
+        parameters:
+          - in: path
+            name: category_id
+            required: true
+            description: The id of recipe category
+            type: int
+          - in: body
+            name: body
+            required: true
+            description: JSON array of recipes, or one recipe per line with application/x-ndjson
+            schema:
+              type: array
+              items:
+                type: object
+                properties:
+                  recipe_name:
+                    type: string
+                  ingredients:
+                    type: string
+                  directions:
+                    type: string
+        responses:
+          201:
+            description: All recipes created successfully
+          400:
+            description: Data validation failed, errors are listed by index of recipe
+          404:
+            description: Invalid recipe category id
+          500:
+            description: Database could not be accessed
+        """
+
+        max_recipes = current_app.config.get('BULK_IMPORT_MAX_RECIPES', 10000)
+        try:
+            items = read_recipes(request, max_recipes)
+        except ValueError:
+            return json_response({'message': 'Please submit a JSON array or NDJSON stream of at ' \
+                    'most %d recipes.' % max_recipes}), 400
+
+        try:
+            category = Category.query.filter_by(id=category_id, user_id=user.id).first()
+            if not category:
+                return json_response({'message': 'Sorry, recipe category could not be found.'}), 404
+
+            recipes, errors, names = [], [], {}
+            for index, item in enumerate(items):
+                if not isinstance(item, dict):
+                    item = {}
+                recipe = {field: item.get(field) if isinstance(item.get(field), str) else '' \
+                        for field in ('recipe_name', 'ingredients', 'directions')}
+                recipe['recipe_name'] = recipe['recipe_name'].strip()
+                messages = {}
+                messages['recipe_name_message'] = validate_recipe_name_format( \
+                        recipe['recipe_name'])
+                messages['ingredients_message'] = validate_ingredients(recipe['ingredients'])
+                messages['directions_message'] = validate_directions(recipe['directions'])
+                if messages['recipe_name_message'] == 'Valid':
+                    if recipe['recipe_name'].lower() in names:
+                        messages['recipe_name_message'] = DUPLICATE_RECIPE_NAME
+                    names.setdefault(recipe['recipe_name'].lower(), index)
+                recipes.append(recipe)
+                errors.append(messages)
+
+            for name in find_duplicate_recipe_names(names, category_id):
+                errors[names[name]]['recipe_name_message'] = DUPLICATE_RECIPE_NAME
+            errors = [dict({key: value for key, value in messages.items() if value != 'Valid'}, \
+                    index=index) for index, messages in enumerate(errors) \
+                    if not data_validator(messages)]
+            if not recipes or errors:
+                return json_response({'errors': errors, 'message': 'Please fix the recipes ' \
+                        'listed in errors, no recipes were created.'}), 400
+
+            ids = Recipe.bulk_create(category_id, recipes, \
+                    current_app.config.get('BULK_IMPORT_BATCH_SIZE', 500))
+            db.session.commit()
+            response = json_response({
+                'count': len(ids),
+                'results': [{'id': recipe_id, 'recipe_name': recipe['recipe_name']} \
+                        for recipe_id, recipe in zip(ids, recipes)]
+            })
+            response.status_code = 201
+        except exc.IntegrityError as error:
+            db.session.rollback()
+            if is_duplicate_recipe_name(error):
+                return json_response({'recipe_name_message': DUPLICATE_RECIPE_NAME}), 400
+            return json_response({'message': str(error)}), 500
+        except exc.SQLAlchemyError as error:
+            db.session.rollback()
+            return json_response({'message': str(error)}), 500
         return response
 
+def read_recipes(request, max_recipes):
+    """
+    Returns recipes submitted as a JSON array, or as one JSON object per line if the request
+    is NDJSON. Raises ValueError for invalid JSON or more than max_recipes recipes.
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/ndjson'):
+        items = []
+        for line in request.stream:
+            if line.strip():
+                items.append(json.loads(line.decode('utf-8')))
+                if len(items) > max_recipes:
+                    raise ValueError('Too many recipes.')
+        return items
+    items = json.loads(request.get_data(as_text=True))
+    if not isinstance(items, list) or len(items) > max_recipes:
+        raise ValueError('Please submit a JSON array of recipes.')
+    return items
+
 recipe_view = RecipeView.as_view('recipe_view')
 recipe_specific_view = RecipeSpecificView.as_view('recipe_specific_view')
 recipe_search_view = RecipeSearchView.as_view('recipe_search_view')
+recipe_bulk_view = RecipeBulkView.as_view('recipe_bulk_view')
+user_recipe_search_view = UserRecipeSearchView.as_view('user_recipe_search_view')
+recipe_ingredient_search_view = RecipeIngredientSearchView.as_view( \
+        'recipe_ingredient_search_view')
+
+def recipe_not_found(user_id, category_id):
+    """ Returns 404 response for a write that matched no recipe, naming what is missing """
+    db.session.rollback()
+    if db.session.query(Category.query.filter_by(id=category_id, user_id=user_id) \
+            .exists()).scalar():
+        response = json_response({'message': 'Sorry, recipe could not be found.'})
+    else:
+        response = json_response({'message': 'Sorry, recipe category could not be found.'})
+    response.status_code = 404
+    return response
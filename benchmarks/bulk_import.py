@@ -0,0 +1,57 @@
+""" Benchmark of importing recipes one request at a time and in one bulk request
+
+Usage: python -m benchmarks.bulk_import [recipes]
+
+Runs against the testing database. Reports the time taken to create the recipes with
+one POST each and with a single JSON array POST to the bulk endpoint.
+"""
+
+import json
+import sys
+import time
+from app import create_app, db
+
+# pylint: disable=C0103
+
+RECIPE = {
+    'ingredients': '1) 2 cups flour, 2) 2 eggs, 3) 1 cup milk, 4) 1 tbsp sugar',
+    'directions': '1) Mix the flour, eggs and milk. 2) Fry in a hot pan. 3) Serve warm.'
+}
+
+def run(count):
+    """ Returns seconds taken by single and bulk creation of count recipes """
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+    try:
+        client = app.test_client()
+        client.post('/api/v1/auth/register', data={
+            'username': 'benchuser', 'email': 'bench@domain.com', 'password': 'Bootcamp17',
+            'confirm_password': 'Bootcamp17'})
+        result = client.post('/api/v1/auth/login', data={'username': 'benchuser', \
+                'password': 'Bootcamp17'})
+        headers = {'Authorization': 'Bearer ' + json.loads(result.data.decode())['access_token']}
+        timings = []
+        for category_name in ['Single', 'Bulk']:
+            result = client.post('/api/v1/category/', headers=headers, \
+                    data={'category_name': category_name})
+            url = '/api/v1/recipe/%d/' % json.loads(result.data.decode())['id']
+            recipes = [dict(RECIPE, recipe_name='Recipe %d' % number) for number in range(count)]
+            started = time.perf_counter()
+            if category_name == 'Single':
+                for recipe in recipes:
+                    client.post(url, headers=headers, data=recipe)
+            else:
+                client.post(url + 'bulk', headers=headers, data=json.dumps(recipes), \
+                        content_type='application/json')
+            timings.append(time.perf_counter() - started)
+        return timings
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+if __name__ == '__main__':
+    recipes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    single, bulk = run(recipes)
+    print('%d recipes: %.2f s one by one, %.2f s in bulk' % (recipes, single, bulk))
@@ -0,0 +1,71 @@
+""" Benchmark of login throughput and of latency of requests served alongside logins
+
+Usage: python -m benchmarks.login_throughput [pool size ...]
+
+Runs against the testing database with the production bcrypt work factor. Each pool
+size is benchmarked with 8 threads logging in, as many as waitress serves, while one
+more thread keeps requesting the API home page.
+"""
+
+import sys
+import threading
+import time
+from app import create_app, db
+
+# pylint: disable=C0103
+
+THREADS = 8
+LOGINS_PER_THREAD = 8
+
+def run(pool_size):
+    """ Returns logins per second and median/max home page latency in ms """
+    app = create_app('testing')
+    app.config['BCRYPT_LOG_ROUNDS'] = 12
+    app.config['BCRYPT_POOL_SIZE'] = pool_size
+    login_data = {'username': 'benchuser', 'password': 'Bootcamp17'}
+    with app.app_context():
+        db.create_all()
+    app.test_client().post('/api/v1/auth/register', data={
+        'username': 'benchuser', 'email': 'bench@domain.com', 'password': 'Bootcamp17',
+        'confirm_password': 'Bootcamp17'})
+
+    def login():
+        """ Log in repeatedly """
+        client = app.test_client()
+        for _ in range(LOGINS_PER_THREAD):
+            client.post('/api/v1/auth/login', data=login_data)
+
+    latencies = []
+    done = threading.Event()
+
+    def poll():
+        """ Request home page until logins are done """
+        client = app.test_client()
+        while not done.is_set():
+            started = time.perf_counter()
+            client.get('/')
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    poller = threading.Thread(target=poll)
+    poller.start()
+    workers = [threading.Thread(target=login) for _ in range(THREADS)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    poller.join()
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+    latencies.sort()
+    return THREADS * LOGINS_PER_THREAD / elapsed, latencies[len(latencies) // 2], latencies[-1]
+
+if __name__ == '__main__':
+    for size in [int(arg) for arg in sys.argv[1:]] or [0, 2, 4]:
+        rate, median, worst = run(size)
+        print('pool size %d: %.1f logins/s, home page median %.2f ms, max %.2f ms' % \
+                (size, rate, median, worst))
@@ -0,0 +1,61 @@
+""" Benchmark of size and CPU cost of recipe list responses for each content encoding
+
+Usage: python -m benchmarks.recipe_list [requests]
+
+Runs against the testing database with a category of 100 recipes. Each encoding is
+requested for a page of 100 recipes, reporting bytes sent and CPU time per request.
+"""
+
+import json
+import sys
+import time
+from app import create_app, db
+from app.v1.utils.compression import brotli
+
+# pylint: disable=C0103
+
+RECIPE = {
+    'ingredients': '1) 2 cups all-purpose flour, 2) 2 eggs, 3) 1 1/2 cups milk, 4) 1 tbsp \
+sugar, 5) 1 tsp baking powder, 6) A pinch of salt, 7) 2 tbsp melted butter',
+    'directions': '1) Whisk the flour, sugar, baking powder and salt in a bowl. 2) Beat in \
+the eggs, milk and melted butter until smooth. 3) Heat a lightly oiled pan over medium heat. \
+4) Pour a quarter cup of batter per pancake and cook until bubbles form. 5) Flip and cook \
+until golden. 6) Serve warm with syrup.'
+}
+
+def run(requests):
+    """ Returns (encoding, bytes, CPU ms per request) for each encoding """
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+    try:
+        client = app.test_client()
+        client.post('/api/v1/auth/register', data={
+            'username': 'benchuser', 'email': 'bench@domain.com', 'password': 'Bootcamp17',
+            'confirm_password': 'Bootcamp17'})
+        result = client.post('/api/v1/auth/login', data={'username': 'benchuser', \
+                'password': 'Bootcamp17'})
+        headers = {'Authorization': 'Bearer ' + json.loads(result.data.decode())['access_token']}
+        result = client.post('/api/v1/category/', headers=headers, \
+                data={'category_name': 'Pancakes'})
+        url = '/api/v1/recipe/%d/' % json.loads(result.data.decode())['id']
+        client.post(url + 'bulk', headers=headers, data=json.dumps([dict(RECIPE, \
+                recipe_name='Pancakes %d' % number) for number in range(100)]), \
+                content_type='application/json')
+        results = []
+        for encoding in ['identity', 'gzip', 'br'] if brotli else ['identity', 'gzip']:
+            started = time.process_time()
+            for _ in range(requests):
+                response = client.get(url + '?limit=100', headers=dict(headers, \
+                        **{'Accept-Encoding': encoding}))
+            elapsed = time.process_time() - started
+            results.append((encoding, len(response.data), elapsed * 1000 / requests))
+        return results
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+if __name__ == '__main__':
+    for encoding, size, cpu in run(int(sys.argv[1]) if len(sys.argv) > 1 else 50):
+        print('%-8s %7d bytes %6.2f ms CPU per request' % (encoding, size, cpu))
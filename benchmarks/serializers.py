@@ -0,0 +1,72 @@
+""" Microbenchmark of serializing a page of 1,000 recipes to a JSON response
+
+Usage: python -m benchmarks.serializers [runs]
+
+Compares building recipe dicts by hand and encoding them with jsonify, as the views used
+to, with the shared serializers using orjson when installed and the stdlib fallback.
+"""
+
+import sys
+import time
+from datetime import datetime
+from unittest.mock import patch
+from flask import jsonify
+from app import create_app
+from app.v1.models.recipe_models import Recipe
+from app.v1.utils import serializers
+
+# pylint: disable=C0103
+
+ROWS = 1000
+
+def make_recipes():
+    """ Returns recipes with ingredients and directions of typical length """
+    recipes = []
+    for number in range(ROWS):
+        recipe = Recipe('Recipe %d' % number, 'Flour, eggs, milk, sugar, butter ' * 10, \
+                'Mix, rest, fry and serve warm. ' * 20, 1)
+        recipe.id = number + 1
+        recipe.date_created = recipe.date_modified = datetime(2018, 1, 9, 7, 5, number % 60)
+        recipes.append(recipe)
+    return recipes
+
+def with_jsonify(recipes):
+    """ Serialize recipes as the views did before the shared serializers """
+    results = []
+    for recipe in recipes:
+        obj = {
+            'id': recipe.id,
+            'recipe_name': recipe.recipe_name,
+            'ingredients': recipe.ingredients,
+            'directions': recipe.directions,
+            'category_id': recipe.category_id,
+            'date_created': recipe.date_created,
+            'date_modified': recipe.date_modified
+        }
+        results.append(obj)
+    return jsonify({'results': results}).get_data()
+
+def with_serializers(recipes):
+    """ Serialize recipes with the shared serializers """
+    return serializers.json_response({'results': [serializers.serialize_recipe(recipe) \
+            for recipe in recipes]}).get_data()
+
+def best_of(func, recipes, runs):
+    """ Returns fastest time of func in ms """
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func(recipes)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    app = create_app('testing')
+    with app.test_request_context():
+        recipes = make_recipes()
+        print('jsonify:              %.1f ms' % best_of(with_jsonify, recipes, runs))
+        with patch.object(serializers, 'orjson', None):
+            print('serializers (stdlib): %.1f ms' % best_of(with_serializers, recipes, runs))
+        if serializers.orjson is not None:
+            print('serializers (orjson): %.1f ms' % best_of(with_serializers, recipes, runs))
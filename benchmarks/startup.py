@@ -0,0 +1,36 @@
+""" Benchmark of worker cold start time and resident memory
+
+Usage: python -m benchmarks.startup [runs]
+
+Each run starts a fresh interpreter that imports run.py, as waitress does, and reports
+the time taken and peak resident memory of the process.
+"""
+
+import subprocess
+import sys
+
+# pylint: disable=C0103
+
+PROBE = """
+import resource, time
+started = time.perf_counter()
+import run
+elapsed = time.perf_counter() - started
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def run(runs):
+    """ Returns median start time in ms and median peak RSS in MiB """
+    timings, memory = [], []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', PROBE], \
+                stderr=subprocess.DEVNULL).decode('utf-8').split()
+        timings.append(float(output[0]) * 1000)
+        memory.append(int(output[1]) / 1024)
+    timings.sort()
+    memory.sort()
+    return timings[runs // 2], memory[runs // 2]
+
+if __name__ == '__main__':
+    elapsed, rss = run(int(sys.argv[1]) if len(sys.argv) > 1 else 9)
+    print('import run: %.1f ms, peak RSS %.1f MiB' % (elapsed, rss))
@@ -15,6 +15,23 @@ class Config(object):
     MAIL_USE_SSL = True
     MAIL_USERNAME = os.getenv('HOST_USERNAME')
     MAIL_PASSWORD = os.getenv('HOST_PASSWORD')
+    MAIL_QUEUE_BATCH_SIZE = 50
+    MAIL_QUEUE_POLL_INTERVAL = 5
+    BCRYPT_LOG_ROUNDS = 12
+    BCRYPT_POOL_SIZE = 2
+    REVOKED_TOKEN_FILTER_CAPACITY = 100000
+    REVOKED_TOKEN_FILTER_ERROR_RATE = 0.001
+    REVOKED_TOKEN_REFRESH_INTERVAL = 5
+    REVOKED_TOKEN_PURGE_INTERVAL = 3600
+    TOKEN_CACHE_SIZE = 10000
+    TOKEN_CACHE_STATS_INTERVAL = 10000
+    BULK_IMPORT_MAX_RECIPES = 10000
+    BULK_IMPORT_BATCH_SIZE = 500
+    EXPORT_BATCH_SIZE = 500
+    COMPRESS_MIN_SIZE = 500
+    COMPRESS_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 4
+    DOCS_CACHE_MAX_AGE = 604800
 
 class TestingConfig(Config):
     """ Testing configurations. """
@@ -22,6 +39,13 @@ class TestingConfig(Config):
     TESTING = True
     SECRET = 'jhdsj%jkej$8jhjdhdjh^&kjdhdjhhdg#63KJhjejhe*hege'
     SQLALCHEMY_DATABASE_URI = 'postgresql://localhost/yummydb_test'
+    MAIL_SERVER = 'localhost'
+    MAIL_PORT = 8025
+    MAIL_USE_SSL = False
+    BCRYPT_LOG_ROUNDS = 4
+    BCRYPT_POOL_SIZE = 1
+    REVOKED_TOKEN_REFRESH_INTERVAL = 0
+    REVOKED_TOKEN_PURGE_INTERVAL = None
 
 class DevelopmentConfig(Config):
     """ Development configurations. """
@@ -4,11 +4,15 @@
 # pylint: disable=C0103
 
 import os
+import time
 
 from flask_script import Manager
 from flask_migrate import Migrate, MigrateCommand
 from app import db, create_app
 from app.v1 import models
+from app.v1.models.auth_models import RevokedToken
+from app.v1.models.recipe_models import Recipe
+from app.v1.utils.mail_queue import send_queued_mail
 
 app = create_app(config_name='development')
 migrate = Migrate(app, db)
@@ -30,5 +34,24 @@ def drop():
     os.system('psql -c "DROP DATABASE IF EXISTS yummydb_test"')
     print('Main and testing databases dropped')
 
+@manager.command
+def purge():
+    """ Command for deleting revoked tokens that have expired. """
+    count = RevokedToken.purge_expired()
+    print('%d expired revoked tokens purged' % count)
+
+@manager.command
+def index_ingredients():
+    """ Command for indexing ingredients of existing recipes. """
+    count = Recipe.index_all_ingredients()
+    print('Ingredients of %d recipes indexed' % count)
+
+@manager.command
+def mailer():
+    """ Command for sending queued emails until interrupted. """
+    while True:
+        if not send_queued_mail(batch_size=app.config['MAIL_QUEUE_BATCH_SIZE']):
+            time.sleep(app.config['MAIL_QUEUE_POLL_INTERVAL'])
+
 if __name__ == '__main__':
     manager.run()
@@ -0,0 +1,33 @@
+"""empty message
+
+Revision ID: 0b6e8d4a2f91
+Revises: f1a7d3e9b5c8
+Create Date: 2026-10-17 16:20:45.671302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b6e8d4a2f91'
+down_revision = 'f1a7d3e9b5c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing recipes are indexed by the index_ingredients manage.py command
+    op.create_table('recipe_ingredients',
+    sa.Column('recipe_id', sa.Integer(), nullable=False),
+    sa.Column('term', sa.String(length=50), nullable=False),
+    sa.ForeignKeyConstraint(['recipe_id'], ['recipes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('recipe_id', 'term')
+    )
+    op.create_index('ix_recipe_ingredients_term_recipe_id', 'recipe_ingredients', \
+            ['term', 'recipe_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_recipe_ingredients_term_recipe_id', table_name='recipe_ingredients')
+    op.drop_table('recipe_ingredients')
@@ -0,0 +1,62 @@
+"""empty message
+
+Revision ID: 5c1e8a7f42d3
+Revises: b2c2d57209db
+Create Date: 2026-10-17 09:12:41.503118
+
+"""
+import hashlib
+from datetime import datetime
+from alembic import op
+import jwt
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e8a7f42d3'
+down_revision = 'b2c2d57209db'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('revoked_tokens', sa.Column('jti', sa.String(length=32), nullable=True))
+    op.add_column('revoked_tokens', sa.Column('expires_on', sa.DateTime(), nullable=True))
+
+    # Tokens issued before the 'jti' claim was introduced are identified by their digest,
+    # see RevokedToken.token_id
+    revoked_tokens = sa.table('revoked_tokens',
+                              sa.column('id', sa.Integer),
+                              sa.column('token', sa.String),
+                              sa.column('jti', sa.String),
+                              sa.column('expires_on', sa.DateTime))
+    connection = op.get_bind()
+    rows = connection.execute(sa.select([revoked_tokens.c.id, revoked_tokens.c.token])).fetchall()
+    for row in rows:
+        try:
+            payload = jwt.decode(row.token, verify=False)
+            expires_on = datetime.utcfromtimestamp(payload['exp'])
+        except (jwt.InvalidTokenError, KeyError):
+            payload, expires_on = {}, datetime.utcnow()
+        connection.execute(revoked_tokens.update().where(revoked_tokens.c.id == row.id).values(
+            jti=payload.get('jti') or hashlib.sha256(row.token.encode('utf-8')).hexdigest()[:32],
+            expires_on=expires_on))
+    connection.execute(revoked_tokens.delete().where(revoked_tokens.c.expires_on < datetime.utcnow()))
+
+    op.alter_column('revoked_tokens', 'jti', nullable=False)
+    op.alter_column('revoked_tokens', 'expires_on', nullable=False)
+    op.create_unique_constraint(None, 'revoked_tokens', ['jti'])
+    op.create_index(op.f('ix_revoked_tokens_expires_on'), 'revoked_tokens', ['expires_on'], unique=False)
+    op.drop_column('revoked_tokens', 'token')
+    op.drop_column('revoked_tokens', 'revoked_on')
+
+
+def downgrade():
+    # Full tokens cannot be recovered from their IDs, revocation records are dropped
+    op.execute('DELETE FROM revoked_tokens')
+    op.add_column('revoked_tokens', sa.Column('revoked_on', sa.DateTime(), nullable=False))
+    op.add_column('revoked_tokens', sa.Column('token', sa.String(length=500), nullable=False))
+    op.create_unique_constraint(None, 'revoked_tokens', ['token'])
+    op.drop_index(op.f('ix_revoked_tokens_expires_on'), table_name='revoked_tokens')
+    op.drop_column('revoked_tokens', 'expires_on')
+    op.drop_column('revoked_tokens', 'jti')
@@ -0,0 +1,34 @@
+"""empty message
+
+Revision ID: 7c3e9f2a5d14
+Revises: 0b6e8d4a2f91
+Create Date: 2026-10-17 17:05:12.480913
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e9f2a5d14'
+down_revision = '0b6e8d4a2f91'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Deleting a user or category deletes its rows in the database, not one by one in the ORM
+    op.drop_constraint('categories_user_id_fkey', 'categories', type_='foreignkey')
+    op.create_foreign_key('categories_user_id_fkey', 'categories', 'users', \
+            ['user_id'], ['id'], ondelete='CASCADE')
+    op.drop_constraint('recipes_category_id_fkey', 'recipes', type_='foreignkey')
+    op.create_foreign_key('recipes_category_id_fkey', 'recipes', 'categories', \
+            ['category_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade():
+    op.drop_constraint('recipes_category_id_fkey', 'recipes', type_='foreignkey')
+    op.create_foreign_key('recipes_category_id_fkey', 'recipes', 'categories', \
+            ['category_id'], ['id'])
+    op.drop_constraint('categories_user_id_fkey', 'categories', type_='foreignkey')
+    op.create_foreign_key('categories_user_id_fkey', 'categories', 'users', \
+            ['user_id'], ['id'])
@@ -0,0 +1,33 @@
+"""empty message
+
+Revision ID: c3f7b1d9e8a2
+Revises: 9a4d2e61c7b0
+Create Date: 2026-10-17 13:41:09.265734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f7b1d9e8a2'
+down_revision = '9a4d2e61c7b0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Categories created with the same name by concurrent requests would violate the new
+    # index, all but the oldest of them are renamed by appending their id
+    op.execute("""
+        UPDATE categories SET category_name = left(category_name, 40) || ' ' || id
+        WHERE id NOT IN (
+            SELECT min(id) FROM categories GROUP BY user_id, lower(category_name)
+        )
+    """)
+    op.create_index('ix_categories_user_id_lower_category_name', 'categories', \
+            ['user_id', sa.text('lower(category_name)')], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_categories_user_id_lower_category_name', table_name='categories')
@@ -0,0 +1,33 @@
+"""empty message
+
+Revision ID: d8e2a5c40f16
+Revises: c3f7b1d9e8a2
+Create Date: 2026-10-17 14:26:52.108347
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8e2a5c40f16'
+down_revision = 'c3f7b1d9e8a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Recipes created with the same name by concurrent requests would violate the new
+    # index, all but the oldest of them are renamed by appending their id
+    op.execute("""
+        UPDATE recipes SET recipe_name = left(recipe_name, 90) || ' ' || id
+        WHERE id NOT IN (
+            SELECT min(id) FROM recipes GROUP BY category_id, lower(recipe_name)
+        )
+    """)
+    op.create_index('ix_recipes_category_id_lower_recipe_name', 'recipes', \
+            ['category_id', sa.text('lower(recipe_name)')], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_recipes_category_id_lower_recipe_name', table_name='recipes')
@@ -0,0 +1,52 @@
+"""empty message
+
+Revision ID: e4b9c2f7a1d3
+Revises: d8e2a5c40f16
+Create Date: 2026-10-17 15:02:11.493820
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b9c2f7a1d3'
+down_revision = 'd8e2a5c40f16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('recipes', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute("""
+        CREATE OR REPLACE FUNCTION recipes_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('english', coalesce(NEW.recipe_name, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(NEW.ingredients, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(NEW.directions, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER recipes_search_vector_update
+            BEFORE INSERT OR UPDATE OF recipe_name, ingredients, directions ON recipes
+            FOR EACH ROW EXECUTE PROCEDURE recipes_search_vector_update()
+    """)
+    op.execute("""
+        UPDATE recipes SET search_vector =
+            setweight(to_tsvector('english', coalesce(recipe_name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(ingredients, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(directions, '')), 'C')
+    """)
+    op.create_index('ix_recipes_search_vector', 'recipes', ['search_vector'], unique=False, \
+            postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_recipes_search_vector', table_name='recipes')
+    op.execute('DROP TRIGGER recipes_search_vector_update ON recipes')
+    op.execute('DROP FUNCTION recipes_search_vector_update()')
+    op.drop_column('recipes', 'search_vector')
@@ -0,0 +1,35 @@
+"""empty message
+
+Revision ID: f1a7d3e9b5c8
+Revises: e4b9c2f7a1d3
+Create Date: 2026-10-17 15:41:37.218064
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a7d3e9b5c8'
+down_revision = 'e4b9c2f7a1d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fuzzy search falls back to scoring names in the app where pg_trgm is not available
+    available = op.get_bind().execute(sa.text( \
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).scalar()
+    if not available:
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_categories_category_name_trgm', 'categories', ['category_name'], \
+            unique=False, postgresql_using='gin', \
+            postgresql_ops={'category_name': 'gin_trgm_ops'})
+    op.create_index('ix_recipes_recipe_name_trgm', 'recipes', ['recipe_name'], unique=False, \
+            postgresql_using='gin', postgresql_ops={'recipe_name': 'gin_trgm_ops'})
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_recipes_recipe_name_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_categories_category_name_trgm')
@@ -0,0 +1,22 @@
+""" Helpers shared by unit tests """
+
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import db
+
+@contextmanager
+def recorded_statements(app):
+    """ Yields list filled with the SQL statements executed on database of app in block """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        """Record executed SQL statement"""
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
@@ -1,10 +1,17 @@
 """ Unit tests for the auth module """
 
+import time
 import unittest
 import json
+from datetime import datetime, timedelta
 from app import create_app, db
+from app.v1.models.auth_models import User, RevokedToken
+from app.v1.utils import hashing
+from app.v1.utils.revocation import RevocationFilter
+from app.v1.utils.token_cache import TokenCache
 
 # pylint: disable=C0103
+# pylint: disable=W0212
 
 class AuthTests(unittest.TestCase):
     """ Authentication tests for registration, login, password_reset and logout """
@@ -121,6 +128,26 @@ the one entered.")
         self.assertEqual(result['message'], "You are now logged in.")
         self.assertTrue(result['access_token'])
 
+    def test_login_rehashes_password_on_cost_change(self):
+        """Test API for password rehash on login after work factor change (POST request)"""
+        self.client().post(self.base_url + 'register', data=self.register_data)
+        self.app.config['BCRYPT_LOG_ROUNDS'] = 5
+        response = self.client().post(self.base_url + 'login', data=self.login_data)
+        self.assertEqual(response.status_code, 200)
+        with self.app.app_context():
+            user = User.query.filter_by(username='newuser').first()
+            self.assertTrue(user.password.startswith('$2b$05$'))
+            self.assertTrue(user.check_password('Bootcamp17'))
+
+    def test_password_hashing_pool_follows_pool_size(self):
+        """Test password hashing runs in a pool of the currently configured size"""
+        for pool_size in [1, 2]:
+            self.app.config['BCRYPT_POOL_SIZE'] = pool_size
+            with self.app.app_context():
+                pw_hash = hashing.generate_password_hash('Bootcamp17')
+                self.assertTrue(hashing.check_password_hash(pw_hash, 'Bootcamp17'))
+            self.assertEqual(hashing._get_pool(pool_size)._max_workers, pool_size)
+
     def test_login_empty_username(self):
         """Test API for user login with empty username (POST request)"""
         self.client().post(self.base_url + 'register', data=self.register_data)
@@ -213,6 +240,123 @@ can only contain 5-80 alphanumeric and underscore characters.")
         result = json.loads(response.data.decode())
         self.assertEqual(result['message'], "Your have been logged out.")
 
+    def test_change_password(self):
+        """Test API for password change by logged in user (POST request)"""
+        self.client().post(self.base_url + 'register', data=self.register_data)
+        response = self.client().post(self.base_url + 'login', data=self.login_data)
+        access_token = json.loads(response.data.decode())['access_token']
+        data = {'new_password': 'Bootcamp18', 'confirm_new_password': 'Bootcamp18'}
+        response = self.client().post(self.base_url + 'change_password', headers=dict( \
+                Authorization="Bearer " + access_token), data=data)
+        self.assertEqual(response.status_code, 200)
+        self.login_data['password'] = 'Bootcamp18'
+        response = self.client().post(self.base_url + 'login', data=self.login_data)
+        self.assertEqual(response.status_code, 200)
+
+    def test_auth_latency_reported(self):
+        """Test API for authentication latency in Server-Timing header (GET request)"""
+        self.client().post(self.base_url + 'register', data=self.register_data)
+        response = self.client().post(self.base_url + 'login', data=self.login_data)
+        access_token = json.loads(response.data.decode())['access_token']
+        response = self.client().get(self.base_url + 'logout', headers=dict(Authorization=\
+                "Bearer " + access_token))
+        self.assertIn('auth;dur=', response.headers.get('Server-Timing'))
+
+    def test_revoked_token_rejected(self):
+        """Test API for reuse of token after logout (GET request)"""
+        self.client().post(self.base_url + 'register', data=self.register_data)
+        response = self.client().post(self.base_url + 'login', data=self.login_data)
+        access_token = json.loads(response.data.decode())['access_token']
+        self.client().get(self.base_url + 'logout', headers=dict(Authorization=\
+                "Bearer " + access_token))
+        response = self.client().get(self.base_url + 'logout', headers=dict(Authorization=\
+                "Bearer " + access_token))
+        self.assertEqual(response.status_code, 401)
+        result = json.loads(response.data.decode())
+        self.assertEqual(result['message'], "Sorry, user could not be found.")
+
+    def test_deleted_user_token_rejected(self):
+        """Test API for password change with token of user deleted after login (POST request)"""
+        self.client().post(self.base_url + 'register', data=self.register_data)
+        response = self.client().post(self.base_url + 'login', data=self.login_data)
+        access_token = json.loads(response.data.decode())['access_token']
+        with self.app.app_context():
+            User.query.filter_by(username='newuser').first().delete()
+        data = {'new_password': 'Bootcamp18', 'confirm_new_password': 'Bootcamp18'}
+        response = self.client().post(self.base_url + 'change_password', headers=dict( \
+                Authorization="Bearer " + access_token), data=data)
+        self.assertEqual(response.status_code, 401)
+        result = json.loads(response.data.decode())
+        self.assertEqual(result['message'], "Sorry, user could not be found.")
+
+    def test_token_revoked_by_other_worker_rejected(self):
+        """Test API for token revoked outside of this worker's revocation filter"""
+        self.client().post(self.base_url + 'register', data=self.register_data)
+        response = self.client().post(self.base_url + 'login', data=self.login_data)
+        access_token = json.loads(response.data.decode())['access_token']
+        with self.app.app_context():
+            RevokedToken.from_token(access_token).save()
+        response = self.client().get(self.base_url + 'logout', headers=dict(Authorization=\
+                "Bearer " + access_token))
+        self.assertEqual(response.status_code, 401)
+
+    def test_token_revoked_with_lower_id_rejected(self):
+        """Test API for revocation committed by other worker after a higher id was read"""
+        self.client().post(self.base_url + 'register', data=self.register_data)
+        access_tokens = [json.loads(self.client().post(self.base_url + 'login', \
+                data=self.login_data).data.decode())['access_token'] for _ in range(2)]
+        with self.app.app_context():
+            revoked_token = RevokedToken.from_token(access_tokens[0])
+            revoked_token.id = 5
+            revoked_token.save()
+        response = self.client().get('/api/v1/category/', headers=dict(Authorization=\
+                "Bearer " + access_tokens[1]))
+        self.assertEqual(response.status_code, 200)
+        with self.app.app_context():
+            revoked_token = RevokedToken.from_token(access_tokens[1])
+            revoked_token.id = 2
+            revoked_token.save()
+        response = self.client().get('/api/v1/category/', headers=dict(Authorization=\
+                "Bearer " + access_tokens[1]))
+        self.assertEqual(response.status_code, 401)
+
+    def test_revocation_filter(self):
+        """Test revocation filter only reports added tokens"""
+        revocation_filter = RevocationFilter(None, 100, 0.001, 5)
+        revocation_filter.add('revoked.token')
+        self.assertIn('revoked.token', revocation_filter.bloom)
+        self.assertNotIn('valid.token', revocation_filter.bloom)
+
+    def test_purge_expired_revoked_tokens(self):
+        """Test deletion of revocation records of expired tokens only"""
+        with self.app.app_context():
+            RevokedToken(jti='expired', expires_on=datetime.utcnow() - timedelta(days=1)).save()
+            RevokedToken(jti='unexpired', expires_on=datetime.utcnow() + timedelta(days=1)).save()
+            self.assertEqual(RevokedToken.purge_expired(), 1)
+            self.assertEqual([token.jti for token in RevokedToken.query.all()], ['unexpired'])
+
+    def test_token_cache(self):
+        """Test verified token cache expiry, eviction and hit rate"""
+        token_cache = TokenCache(2)
+        token_cache.put('expired', {'sub': 1, 'exp': time.time() - 1})
+        self.assertIsNone(token_cache.get('expired'))
+        token_cache.put('first', {'sub': 1, 'exp': time.time() + 60})
+        token_cache.put('second', {'sub': 2, 'exp': time.time() + 60})
+        self.assertEqual(token_cache.get('first')['sub'], 1)
+        token_cache.put('third', {'sub': 3, 'exp': time.time() + 60})
+        self.assertIsNone(token_cache.get('second'))
+        self.assertEqual(token_cache.stats()['evictions'], 1)
+        self.assertEqual(token_cache.stats()['hit_rate'], 0.3333)
+
+    def test_logout_evicts_cached_token(self):
+        """Test API for eviction of token from verified token cache on logout"""
+        self.client().post(self.base_url + 'register', data=self.register_data)
+        response = self.client().post(self.base_url + 'login', data=self.login_data)
+        access_token = json.loads(response.data.decode())['access_token']
+        self.client().get(self.base_url + 'logout', headers=dict(Authorization=\
+                "Bearer " + access_token))
+        self.assertNotIn(access_token, self.app.extensions['token_cache'].entries)
+
     def test_invalid_api_key(self):
         """Test API for API Key (GET request)"""
         self.client().post(self.base_url + 'register', data=self.register_data)
@@ -2,7 +2,9 @@
 
 import unittest
 import json
+from unittest.mock import patch
 from app import create_app, db
+from tests import recorded_statements
 
 # pylint: disable=C0103
 
@@ -63,6 +65,19 @@ class CategoryTests(unittest.TestCase):
         self.assertEqual(result['category_name_message'], "A category with this category name \
 is already available.")
 
+    def test_create_concurrent_category_name(self):
+        """Test API for category creation racing another with same name (POST request)"""
+        self.client().post(self.base_url, headers=dict(Authorization="Bearer " + \
+                self.access_token), data=self.category)
+        self.category['category_name'] = 'BREAKFAST'
+        with patch('app.v1.views.category_views.validate_category_name', return_value='Valid'):
+            response = self.client().post(self.base_url, headers=dict(Authorization="Bearer " + \
+                    self.access_token), data=self.category)
+        self.assertEqual(response.status_code, 400)
+        result = json.loads(response.data.decode())
+        self.assertEqual(result['category_name_message'], "A category with this category name \
+is already available.")
+
     def test_get_categories_set_values(self):
         """Test API for retrieval of categories with set page and limit values (GET request)"""
         self.client().post(self.base_url, headers=dict(Authorization="Bearer " + \
@@ -91,6 +106,27 @@ is already available.")
         result = json.loads(response.data.decode())
         self.assertEqual(result['message'], "Please enter valid page and limit values.")
 
+    def test_get_categories_paginated(self):
+        """Test API for retrieval of a later page of categories (GET request)"""
+        for category_name in ['Breakfast', 'Lunch', 'Supper']:
+            self.client().post(self.base_url, headers=dict(Authorization="Bearer " + \
+                    self.access_token), data={'category_name': category_name})
+        response = self.client().get(self.base_url + '?page=2&limit=2', headers= \
+                dict(Authorization="Bearer " + self.access_token))
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data.decode())
+        self.assertEqual([category['category_name'] for category in result['results']], \
+                ['Supper'])
+        self.assertEqual(result['pages'], 2)
+        self.assertEqual(result['previous_link'], '/api/v1/category/?page=1&limit=2')
+        self.assertEqual(result['next_link'], '')
+
+    def test_get_categories_non_positive_values(self):
+        """Test API for retrieval of categories with zero page and limit values (GET request)"""
+        response = self.client().get(self.base_url + '?page=0&limit=0', headers= \
+                dict(Authorization="Bearer " + self.access_token))
+        self.assertEqual(response.status_code, 400)
+
     def test_get_category_by_valid_id(self):
         """Test API for retrieval of specific category with valid category id (GET request)"""
         response = self.client().post(self.base_url, headers=dict(Authorization="Bearer " + \
@@ -155,6 +191,30 @@ is already available.")
                 dict(Authorization="Bearer " + self.access_token))
         self.assertEqual(response.status_code, 404)
 
+    def test_delete_category_cascades_single_statement(self):
+        """Test API for deletion of category and its recipes with one statement (DELETE request)"""
+        response = self.client().post(self.base_url, headers=dict(Authorization="Bearer " + \
+                self.access_token), data=self.category)
+        category_id = json.loads(response.data.decode())['id']
+        recipe = {'recipe_name': 'Pancakes', 'ingredients': 'Flour, eggs, milk',
+                  'directions': 'Mix and fry'}
+        for recipe_name in ['Pancakes', 'Omelette', 'Waffles']:
+            self.client().post('/api/v1/recipe/{}/'.format(category_id), headers= \
+                    dict(Authorization="Bearer " + self.access_token), \
+                    data=dict(recipe, recipe_name=recipe_name))
+        with recorded_statements(self.app) as statements:
+            response = self.client().delete(self.base_url + '{}'.format(category_id), \
+                    headers=dict(Authorization="Bearer " + self.access_token))
+        with self.app.app_context():
+            remaining = [db.session.execute('SELECT count(*) FROM {}'.format(table)).scalar() \
+                    for table in ['recipes', 'recipe_ingredients']]
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data.decode())['message'], \
+                'Category Breakfast has been deleted')
+        self.assertEqual([statement.split()[0] for statement in statements if \
+                'recipes' in statement or 'categories' in statement], ['DELETE'])
+        self.assertEqual(remaining, [0, 0])
+
     def test_delete_category_by_invalid_id(self):
         """Test API for delete of specific category with invalid id (GET request)"""
         response = self.client().delete(self.base_url + '1', headers=dict(Authorization= \
@@ -186,6 +246,81 @@ is already available.")
         result = json.loads(response.data.decode())
         self.assertEqual(result['message'], "Please enter valid page and limit values.")
 
+    def test_view_category_not_modified(self):
+        """Test API for conditional retrieval of category and categories by ETag (GET request)"""
+        response = self.client().post(self.base_url, headers=dict(Authorization="Bearer " + \
+                self.access_token), data=self.category)
+        category_id = json.loads(response.data.decode())['id']
+        for name, url in [('Lunch', self.base_url), ('Dinner', self.base_url + \
+                '{}'.format(category_id))]:
+            response = self.client().get(url, headers=dict(Authorization="Bearer " + \
+                    self.access_token))
+            etag = response.headers['ETag']
+            response = self.client().get(url, headers={'Authorization': "Bearer " + \
+                    self.access_token, 'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.data, b'')
+            self.assertEqual(response.headers['ETag'], etag)
+            self.client().put(self.base_url + '{}'.format(category_id), headers= \
+                    dict(Authorization="Bearer " + self.access_token), \
+                    data={'category_name': name})
+            response = self.client().get(url, headers={'Authorization': "Bearer " + \
+                    self.access_token, 'If-None-Match': etag})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response.headers['ETag'], etag)
+        response = self.client().get(self.base_url + '?limit=1', headers={'Authorization': \
+                "Bearer " + self.access_token, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_export_categories(self):
+        """Test API for streaming export of categories and their recipes (GET request)"""
+        self.app.config['EXPORT_BATCH_SIZE'] = 2
+        recipe = {'recipe_name': 'Pancakes', 'ingredients': 'Flour, eggs, milk',
+                  'directions': 'Mix and fry.'}
+        category_ids = []
+        for category_name in ['Breakfast', 'Lunch', 'Dinner']:
+            response = self.client().post(self.base_url, headers=dict(Authorization= \
+                    "Bearer " + self.access_token), data={'category_name': category_name})
+            category_ids.append(json.loads(response.data.decode())['id'])
+        for category_id, recipe_name in [(category_ids[0], 'Pancakes'), \
+                (category_ids[2], 'Pasta'), (category_ids[0], 'Omelette')]:
+            self.client().post('/api/v1/recipe/{}/'.format(category_id), headers= \
+                    dict(Authorization="Bearer " + self.access_token), \
+                    data=dict(recipe, recipe_name=recipe_name))
+        response = self.client().get(self.base_url + 'export', headers=dict(Authorization= \
+                "Bearer " + self.access_token))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        self.assertEqual([(line['type'], line.get('category_name') or line['recipe_name']) \
+                for line in lines], [('category', 'Breakfast'), ('recipe', 'Pancakes'), \
+                ('recipe', 'Omelette'), ('category', 'Lunch'), ('category', 'Dinner'), \
+                ('recipe', 'Pasta')])
+
+    def test_view_categories_counted_once(self):
+        """Test API for listing categories counting them once for ETag and pages (GET request)"""
+        for category_name in ['Breakfast', 'Lunch', 'Dinner']:
+            self.client().post(self.base_url, headers=dict(Authorization="Bearer " + \
+                    self.access_token), data={'category_name': category_name})
+        with recorded_statements(self.app) as statements:
+            response = self.client().get(self.base_url + '?page=2&limit=2', headers= \
+                    dict(Authorization="Bearer " + self.access_token))
+        result = json.loads(response.data.decode())
+        self.assertEqual((result['page'], result['pages']), (2, 2))
+        self.assertEqual([category['category_name'] for category in result['results']], \
+                ['Dinner'])
+        self.assertEqual(len([statement for statement in statements if 'count(' in \
+                statement]), 1)
+
+    def test_view_categories_without_loading_user(self):
+        """Test API for listing categories without querying users table (GET request)"""
+        with recorded_statements(self.app) as statements:
+            response = self.client().get(self.base_url, headers=dict(Authorization= \
+                    "Bearer " + self.access_token))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([statement for statement in statements if 'FROM users' in statement])
+
     def tearDown(self):
         """Teardown initialized variables"""
         with self.app.app_context():
@@ -0,0 +1,93 @@
+""" Unit tests for response compression and precompressed API docs """
+
+import gzip
+import json
+import os
+import unittest
+from app import create_app, db
+from app.v1.utils.compression import brotli
+
+# pylint: disable=C0103
+
+class CompressionTests(unittest.TestCase):
+    """ Tests for compression of API responses and API docs """
+
+    def setUp(self):
+        """Define test variables and initialize app"""
+        self.app = create_app(config_name="testing")
+        self.client = self.app.test_client
+        register_data = {'username': 'newuser',
+                         'email': 'example@domain.com',
+                         'password': 'Bootcamp17',
+                         'confirm_password': 'Bootcamp17'
+                        }
+        login_data = {'username': 'newuser', 'password': 'Bootcamp17'}
+        with self.app.app_context():
+            db.create_all()
+            self.client().post('/api/v1/auth/register', data=register_data)
+            result = self.client().post('/api/v1/auth/login', data=login_data)
+            self.access_token = json.loads(result.data.decode())['access_token']
+            for category_name in ['Breakfast', 'Lunch', 'Dinner', 'Snacks', 'Drinks']:
+                self.client().post('/api/v1/category/', headers=dict(Authorization= \
+                        "Bearer " + self.access_token), data={'category_name': category_name})
+
+    def test_compress_json(self):
+        """Test API for gzip compression of large JSON responses (GET request)"""
+        response = self.client().get('/api/v1/category/', headers=dict(Authorization= \
+                "Bearer " + self.access_token))
+        self.assertNotIn('Content-Encoding', response.headers)
+        body = response.data
+        response = self.client().get('/api/v1/category/', headers={'Authorization': \
+                "Bearer " + self.access_token, 'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(gzip.decompress(response.data), body)
+        self.assertLess(len(response.data), len(body))
+        self.assertTrue(response.headers['ETag'].startswith('W/'))
+        response = self.client().get('/api/v1/category/', headers={'Authorization': \
+                "Bearer " + self.access_token, 'Accept-Encoding': 'gzip', \
+                'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_skip_small_responses(self):
+        """Test API for uncompressed responses below the size threshold (GET request)"""
+        response = self.client().get('/api/v1/category/1', headers={'Authorization': \
+                "Bearer " + self.access_token, 'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    @unittest.skipIf(brotli is None, 'brotli is not installed')
+    def test_compress_json_brotli(self):
+        """Test API for brotli compression when preferred by client (GET request)"""
+        response = self.client().get('/api/v1/category/', headers={'Authorization': \
+                "Bearer " + self.access_token, 'Accept-Encoding': 'gzip, br'})
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+        self.assertEqual(json.loads(brotli.decompress(response.data).decode())['pages'], 1)
+
+    def test_docs_precompressed(self):
+        """Test API docs spec and assets are compressed once and cached (GET request)"""
+        static_folder = self.app.blueprints['flasgger'].static_folder
+        asset = sorted(name for name in os.listdir(static_folder) if name.endswith('.css'))[0]
+        for url in ['/apispec_1.json', '/flasgger_static/' + asset]:
+            response = self.client().get(url, headers={'Accept-Encoding': 'gzip'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+            self.assertIn('max-age=604800', response.headers['Cache-Control'])
+            body = gzip.decompress(response.data)
+            self.assertIn((url, 'gzip'), self.app.extensions['docs_cache'].entries)
+            response = self.client().get(url, headers={'Accept-Encoding': 'gzip'})
+            self.assertEqual(gzip.decompress(response.data), body)
+            response = self.client().get(url, headers={'Accept-Encoding': 'gzip', \
+                    'If-None-Match': response.headers['ETag']})
+            self.assertEqual(response.status_code, 304)
+            response = self.client().get(url)
+            self.assertEqual(response.data, body)
+
+    def tearDown(self):
+        """Teardown initialized variables"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+""" Unit tests for the mail queue """
+
+import socketserver
+import threading
+import unittest
+from app import create_app, db, mail
+from app.v1.models.mail_models import QueuedMail
+from app.v1.utils.mail_queue import send_queued_mail
+
+# pylint: disable=C0103
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """ Minimal SMTP dialogue, stores received messages on server """
+
+    def reply(self, line):
+        """Send SMTP reply line"""
+        self.wfile.write((line + '\r\n').encode('utf-8'))
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply('220 localhost SMTP stand-in')
+        while True:
+            line = self.rfile.readline().decode('utf-8').strip()
+            command = line[:4].upper()
+            if not line or command == 'QUIT':
+                self.reply('221 Bye')
+                break
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                for data in iter(self.rfile.readline, b''):
+                    if data == b'.\r\n':
+                        break
+                    lines.append(data.decode('utf-8'))
+                self.server.messages.append(''.join(lines))
+                self.reply('250 OK')
+            elif command == 'RCPT' and self.server.rejected in line:
+                self.reply('550 No such user')
+            else:
+                self.reply('250 OK')
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """ Local SMTP server recording connections and messages """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        socketserver.ThreadingTCPServer.__init__(self, ('localhost', 0), SMTPHandler)
+        self.connections = 0
+        self.messages = []
+        self.rejected = 'rejected@domain.com'
+
+class MailQueueTests(unittest.TestCase):
+    """ Tests for queueing and sending emails """
+
+    def setUp(self):
+        """Define test variables, start SMTP stand-in and initialize app"""
+        self.smtp = SMTPStandIn()
+        threading.Thread(target=self.smtp.serve_forever, daemon=True).start()
+        self.app = create_app(config_name="testing")
+        self.app.config['MAIL_PORT'] = self.smtp.server_address[1]
+        self.app.config['MAIL_SUPPRESS_SEND'] = False
+        mail.init_app(self.app)
+        self.client = self.app.test_client
+        self.register_data = {'username': 'newuser',
+                              'email': 'example@domain.com',
+                              'password': 'Bootcamp17',
+                              'confirm_password': 'Bootcamp17'
+                             }
+        with self.app.app_context():
+            db.create_all()
+
+    def test_password_reset_queues_mail(self):
+        """Test API for password reset queueing email without contacting mail server"""
+        self.client().post('/api/v1/auth/register', data=self.register_data)
+        response = self.client().post('/api/v1/auth/reset_password', \
+                data={'email': 'example@domain.com'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.smtp.connections, 0)
+        with self.app.app_context():
+            queued = QueuedMail.query.all()
+            self.assertEqual(len(queued), 1)
+            self.assertEqual(queued[0].recipient, 'example@domain.com')
+
+    def test_send_queued_mail_reuses_connection(self):
+        """Test sending of all queued emails over one SMTP connection"""
+        with self.app.app_context():
+            for number in range(3):
+                db.session.add(QueuedMail('user%d@domain.com' % number, 'Subject', 'Body'))
+            db.session.commit()
+            self.assertEqual(send_queued_mail(), 3)
+            self.assertEqual(QueuedMail.query.count(), 0)
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertEqual(len(self.smtp.messages), 3)
+
+    def test_send_queued_mail_retries_failures(self):
+        """Test failed emails stay queued with attempt recorded"""
+        with self.app.app_context():
+            db.session.add(QueuedMail('rejected@domain.com', 'Subject', 'Body'))
+            db.session.add(QueuedMail('user@domain.com', 'Subject', 'Body'))
+            db.session.commit()
+            self.assertEqual(send_queued_mail(), 1)
+            queued = QueuedMail.query.all()
+            self.assertEqual([(mail.recipient, mail.attempts) for mail in queued], \
+                    [('rejected@domain.com', 1)])
+            self.assertEqual(send_queued_mail(max_attempts=1), 0)
+
+    def test_send_queued_mail_removes_body_after_max_attempts(self):
+        """Test emails failing max_attempts times are removed with their body"""
+        with self.app.app_context():
+            db.session.add(QueuedMail('rejected@domain.com', 'Password Reset', \
+                    'Your new password is Reset1234'))
+            db.session.commit()
+            for _ in range(3):
+                self.assertEqual(send_queued_mail(max_attempts=3), 0)
+            self.assertEqual(QueuedMail.query.count(), 0)
+            self.assertFalse(db.session.query(QueuedMail.query.filter( \
+                    QueuedMail.body.contains('Reset1234')).exists()).scalar())
+
+    def tearDown(self):
+        """Teardown initialized variables and stop SMTP stand-in"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+        self.smtp.shutdown()
+        self.smtp.server_close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,11 @@
 
 import unittest
 import json
+from unittest.mock import patch
 from app import create_app, db
+from app.v1.models.recipe_models import Recipe, RecipeIngredient
+from app.v1.validators.recipe_validators import DUPLICATE_RECIPE_NAME
+from tests import recorded_statements
 
 # pylint: disable=C0103
 
@@ -85,6 +89,24 @@ the mixing spoon. 6) Garnish with a light dusting of cocoa, and serve.'
         self.assertEqual(result['recipe_name_message'], "A recipe with this recipe name \
 is already available.")
 
+    def test_update_concurrent_recipe_name(self):
+        """Test API for recipe update racing another to the same name (PUT request)"""
+        self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        self.recipe['recipe_name'] = 'Espresso Con Panna'
+        response = self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        recipe_id = json.loads(response.data.decode())['id']
+        self.recipe['recipe_name'] = 'espresso esiri'
+        with patch('app.v1.views.recipe_views.validate_recipe_name', return_value='Valid'):
+            response = self.client().put(self.base_url + '{}/{}'.format(self.category_id, \
+                    recipe_id), headers=dict(Authorization="Bearer " + self.access_token), \
+                    data=self.recipe)
+        self.assertEqual(response.status_code, 400)
+        result = json.loads(response.data.decode())
+        self.assertEqual(result['recipe_name_message'], "A recipe with this recipe name \
+is already available.")
+
     def test_create_empty_ingredients(self):
         """Test API for unsuccessful recipe creation with empty ingredients (POST request)"""
         self.recipe['ingredients'] = ''
@@ -130,6 +152,202 @@ is already available.")
         result = json.loads(response.data.decode())
         self.assertEqual(result['message'], "Please enter valid page and limit values.")
 
+    def test_bulk_create_recipes(self):
+        """Test API for creation of recipes in batches from JSON and NDJSON (POST request)"""
+        self.app.config['BULK_IMPORT_BATCH_SIZE'] = 2
+        recipes = [dict(self.recipe, recipe_name='Espresso %d' % number) for number in range(5)]
+        response = self.client().post(self.base_url + '{}/bulk'.format(self.category_id), \
+                headers=dict(Authorization="Bearer " + self.access_token), \
+                data=json.dumps(recipes), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        result = json.loads(response.data.decode())
+        self.assertEqual(result['count'], 5)
+        self.assertEqual([recipe['recipe_name'] for recipe in result['results']], \
+                ['Espresso %d' % number for number in range(5)])
+        recipes = [{'recipe_name': 'Cocoa Pancakes', 'ingredients': 'Flour, eggs, cocoa', \
+                'directions': 'Mix and fry.'}, {'recipe_name': 'Iced Tea', \
+                'ingredients': 'Tea, ice', 'directions': 'Brew and chill.'}]
+        response = self.client().post(self.base_url + '{}/bulk'.format(self.category_id), \
+                headers=dict(Authorization="Bearer " + self.access_token), \
+                data='\n'.join(json.dumps(recipe) for recipe in recipes) + '\n', \
+                content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        response = self.client().get(self.base_url + 'ingredients?q=cocoa,egg', headers= \
+                dict(Authorization="Bearer " + self.access_token))
+        result = json.loads(response.data.decode())
+        self.assertEqual([recipe['recipe_name'] for recipe in result['results']], \
+                ['Cocoa Pancakes'])
+        response = self.client().get(self.base_url + '{}/?limit=10'.format(self.category_id), \
+                headers=dict(Authorization="Bearer " + self.access_token))
+        self.assertEqual(len(json.loads(response.data.decode())['results']), 7)
+
+    def test_bulk_create_invalid_recipes(self):
+        """Test API for per recipe errors of invalid bulk creation (POST request)"""
+        self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        recipes = [dict(self.recipe, recipe_name='Iced Espresso'),
+                   dict(self.recipe, recipe_name='espresso esiri'),
+                   dict(self.recipe, recipe_name='Iced espresso', ingredients=''),
+                   'Espresso']
+        response = self.client().post(self.base_url + '{}/bulk'.format(self.category_id), \
+                headers=dict(Authorization="Bearer " + self.access_token), \
+                data=json.dumps(recipes), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        result = json.loads(response.data.decode())
+        self.assertEqual(result['errors'], [
+            {'index': 1, 'recipe_name_message': DUPLICATE_RECIPE_NAME},
+            {'index': 2, 'recipe_name_message': DUPLICATE_RECIPE_NAME,
+             'ingredients_message': 'Please enter ingredients.'},
+            {'index': 3, 'recipe_name_message': 'Please enter recipe name.',
+             'ingredients_message': 'Please enter ingredients.',
+             'directions_message': 'Please enter directions.'}])
+        response = self.client().post(self.base_url + '{}/bulk'.format(self.category_id), \
+                headers=dict(Authorization="Bearer " + self.access_token), \
+                data='{"recipe_name": ', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client().get(self.base_url + '{}/'.format(self.category_id), \
+                headers=dict(Authorization="Bearer " + self.access_token))
+        self.assertEqual(len(json.loads(response.data.decode())['results']), 1)
+
+    def test_get_recipes_by_cursor(self):
+        """Test API for retrieval of recipes by cursor with rows added between pages (GET request)"""
+        for recipe_name in ['Espresso One', 'Espresso Two', 'Espresso Three']:
+            self.recipe['recipe_name'] = recipe_name
+            self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                    dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        response = self.client().get(self.base_url + '{}/?after=&limit=2'. \
+                format(self.category_id), headers=dict(Authorization="Bearer " + self.access_token))
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data.decode())
+        self.assertEqual([recipe['recipe_name'] for recipe in result['results']], \
+                ['Espresso One', 'Espresso Two'])
+        self.assertEqual(result['previous_link'], '')
+        self.recipe['recipe_name'] = 'Espresso Four'
+        self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        response = self.client().get(result['next_link'], headers=dict(Authorization= \
+                "Bearer " + self.access_token))
+        result = json.loads(response.data.decode())
+        self.assertEqual([recipe['recipe_name'] for recipe in result['results']], \
+                ['Espresso Three', 'Espresso Four'])
+        self.assertEqual(result['next_link'], '')
+        response = self.client().get(result['previous_link'], headers=dict(Authorization= \
+                "Bearer " + self.access_token))
+        result = json.loads(response.data.decode())
+        self.assertEqual([recipe['recipe_name'] for recipe in result['results']], \
+                ['Espresso One', 'Espresso Two'])
+
+    def test_get_recipe_single_query(self):
+        """Test API for retrieval of recipe with one query for category and recipe (GET request)"""
+        response = self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        recipe_id = json.loads(response.data.decode())['id']
+        with recorded_statements(self.app) as statements:
+            responses = [self.client().get(self.base_url + url, headers=dict( \
+                    Authorization="Bearer " + self.access_token)) for url in \
+                    ['{}/{}'.format(self.category_id, recipe_id), \
+                    '{}/{}'.format(self.category_id, recipe_id + 1), \
+                    '{}/{}'.format(self.category_id + 1, recipe_id)]]
+        self.assertEqual([response.status_code for response in responses], [200, 404, 404])
+        self.assertEqual([json.loads(response.data.decode()).get('message') for response in \
+                responses], [None, 'Sorry, recipe could not be found.', \
+                'Sorry, recipe category could not be found.'])
+        self.assertEqual(len([statement for statement in statements if 'categories' in \
+                statement or 'recipes' in statement]), 3)
+
+    def test_update_delete_recipe_single_statement(self):
+        """Test API for update and delete of recipe with one RETURNING statement (PUT/DELETE)"""
+        response = self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        recipe_id = json.loads(response.data.decode())['id']
+        url = self.base_url + '{}/{}'.format(self.category_id, recipe_id)
+        self.recipe['ingredients'] = '2 cups milk, 1 teaspoon honey'
+        with recorded_statements(self.app) as statements:
+            updated = self.client().put(url, headers=dict(Authorization="Bearer " + \
+                    self.access_token), data=self.recipe)
+            deleted = self.client().delete(url, headers=dict(Authorization="Bearer " + \
+                    self.access_token))
+        self.assertEqual(updated.status_code, 200)
+        self.assertEqual(json.loads(updated.data.decode())['ingredients'], \
+                '2 cups milk, 1 teaspoon honey')
+        self.assertEqual(deleted.status_code, 200)
+        self.assertEqual(json.loads(deleted.data.decode())['message'], \
+                'Recipe Espresso Esiri has been deleted.')
+        writes = [statement.split()[0] for statement in statements if 'RETURNING' in statement]
+        self.assertEqual(writes, ['UPDATE', 'DELETE'])
+        self.assertFalse([statement for statement in statements if \
+                statement.startswith('SELECT recipes.')])
+
+    def test_get_recipe_not_modified(self):
+        """Test API for conditional retrieval of recipe and recipes by ETag (GET request)"""
+        response = self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        recipe_id = json.loads(response.data.decode())['id']
+        for url in [self.base_url + '{}/'.format(self.category_id), \
+                self.base_url + '{}/{}'.format(self.category_id, recipe_id)]:
+            response = self.client().get(url, headers=dict(Authorization="Bearer " + \
+                    self.access_token))
+            etag = response.headers['ETag']
+            response = self.client().get(url, headers={'Authorization': "Bearer " + \
+                    self.access_token, 'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            self.client().put(self.base_url + '{}/{}'.format(self.category_id, recipe_id), \
+                    headers=dict(Authorization="Bearer " + self.access_token), \
+                    data=dict(self.recipe, directions=url))
+            response = self.client().get(url, headers={'Authorization': "Bearer " + \
+                    self.access_token, 'If-None-Match': etag})
+            self.assertEqual(response.status_code, 200)
+        response = self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), \
+                data=dict(self.recipe, recipe_name='Iced Espresso'))
+        response = self.client().get(self.base_url + '{}/'.format(self.category_id), \
+                headers=dict(Authorization="Bearer " + self.access_token))
+        etag = response.headers['ETag']
+        self.client().delete(self.base_url + '{}/{}'.format(self.category_id, recipe_id), \
+                headers=dict(Authorization="Bearer " + self.access_token))
+        response = self.client().get(self.base_url + '{}/'.format(self.category_id), \
+                headers={'Authorization': "Bearer " + self.access_token, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_recipes_summary(self):
+        """Test API for retrieval of recipe summaries without loading long columns (GET request)"""
+        for recipe_name in ['Espresso One', 'Espresso Two']:
+            self.recipe['recipe_name'] = recipe_name
+            self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                    dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        with recorded_statements(self.app) as statements:
+            response = self.client().get(self.base_url + '{}/?view=summary&limit=1'. \
+                    format(self.category_id), headers=dict(Authorization="Bearer " + \
+                    self.access_token))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([statement for statement in statements if 'recipes.ingredients' in \
+                statement or 'recipes.directions' in statement])
+        result = json.loads(response.data.decode())
+        self.assertEqual(sorted(result['results'][0]), ['category_id', 'date_created', \
+                'date_modified', 'id', 'recipe_name'])
+        self.assertIn('view=summary', result['next_link'])
+        response = self.client().get(self.base_url + '{}/search?q=two&fields=recipe_name'. \
+                format(self.category_id), headers=dict(Authorization="Bearer " + \
+                self.access_token))
+        result = json.loads(response.data.decode())
+        self.assertEqual(result['results'], [{'id': 2, 'recipe_name': 'Espresso Two'}])
+        response = self.client().get(self.base_url + 'search?q=two&fields=category_name', \
+                headers=dict(Authorization="Bearer " + self.access_token))
+        result = json.loads(response.data.decode())
+        self.assertEqual(result['results'], [{'id': 2, 'category_name': 'Breakfast'}])
+        response = self.client().get(self.base_url + '{}/?fields=recipe_name,password'. \
+                format(self.category_id), headers=dict(Authorization="Bearer " + \
+                self.access_token))
+        self.assertEqual(response.status_code, 400)
+        result = json.loads(response.data.decode())
+        self.assertEqual(result['message'], "Please enter valid fields.")
+
+    def test_get_recipes_invalid_cursor(self):
+        """Test API for retrieval of recipes with invalid cursor (GET request)"""
+        response = self.client().get(self.base_url + '{}/?after=not-a-cursor'. \
+                format(self.category_id), headers=dict(Authorization="Bearer " + self.access_token))
+        self.assertEqual(response.status_code, 400)
+
     def test_get_recipe_by_id_valid(self):
         """Test API for retrieval of specific valid recipe id (GET request)"""
         response = self.client().post(self.base_url + '{}/'.format(self.category_id), \
@@ -265,6 +483,117 @@ is already available.")
         result = json.loads(response.data.decode())
         self.assertEqual(result['message'], "Please enter valid page and limit values.")
 
+    def test_search_recipe_ranked(self):
+        """Test API for ranked recipe search over names, ingredients and directions"""
+        self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        recipe = {'recipe_name': 'Cocoa Pancakes', 'ingredients': 'Flour, eggs, milk',
+                  'directions': 'Mix and fry.'}
+        self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=recipe)
+        response = self.client().get(self.base_url + '{}/search?q=cocoa&mode=rank'. \
+                format(self.category_id), headers=dict(Authorization= \
+                "Bearer " + self.access_token))
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data.decode())
+        self.assertEqual([recipe['recipe_name'] for recipe in result['results']], \
+                ['Cocoa Pancakes', 'Espresso Esiri'])
+        response = self.client().get(self.base_url + '{}/search?q=benedictine+cream&mode=rank'. \
+                format(self.category_id), headers=dict(Authorization= \
+                "Bearer " + self.access_token))
+        result = json.loads(response.data.decode())
+        self.assertEqual([recipe['recipe_name'] for recipe in result['results']], \
+                ['Espresso Esiri'])
+
+    def test_search_all_recipes(self):
+        """Test API for recipe search across all categories of a user (GET request)"""
+        self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        response = self.client().post('/api/v1/category/', headers=dict(Authorization= \
+                "Bearer " + self.access_token), data={'category_name': 'Drinks'})
+        category_id = json.loads(response.data.decode())['id']
+        recipe = dict(self.recipe, recipe_name='Iced Espresso')
+        self.client().post(self.base_url + '{}/'.format(category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=recipe)
+        for mode in ['', 'rank', 'fuzzy']:
+            response = self.client().get(self.base_url + 'search?q=espresso&mode={}&limit=1'. \
+                    format(mode), headers=dict(Authorization="Bearer " + self.access_token))
+            self.assertEqual(response.status_code, 200)
+            result = json.loads(response.data.decode())
+            self.assertEqual(result['pages'], 2)
+            response = self.client().get(result['next_link'], headers=dict(Authorization= \
+                    "Bearer " + self.access_token))
+            self.assertEqual(response.status_code, 200)
+            result['results'] += json.loads(response.data.decode())['results']
+            self.assertEqual(sorted((recipe['recipe_name'], recipe['category_name']) \
+                    for recipe in result['results']), [('Espresso Esiri', 'Breakfast'), \
+                    ('Iced Espresso', 'Drinks')])
+
+    def test_search_recipes_by_ingredients(self):
+        """Test API for recipe search by all or any of several ingredients (GET request)"""
+        self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        recipe = {'recipe_name': 'Cocoa Pancakes', 'ingredients': '2 cups flour, 2 Eggs, \
+1 tbsp cocoa powder', 'directions': 'Mix and fry.'}
+        response = self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=recipe)
+        recipe_id = json.loads(response.data.decode())['id']
+        searches = [('cocoa', ['Espresso Esiri', 'Cocoa Pancakes']),
+                    ('cocoa, egg', ['Cocoa Pancakes']),
+                    ('egg, cream&match=any', ['Espresso Esiri', 'Cocoa Pancakes']),
+                    ('cinnamon', [])]
+        for q, names in searches:
+            response = self.client().get(self.base_url + 'ingredients?q=' + q, headers= \
+                    dict(Authorization="Bearer " + self.access_token))
+            self.assertEqual(response.status_code, 200)
+            result = json.loads(response.data.decode())
+            self.assertEqual([recipe['recipe_name'] for recipe in result['results']], names)
+        recipe['ingredients'] = 'Flour, eggs, cinnamon'
+        self.client().put(self.base_url + '{}/{}'.format(self.category_id, recipe_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=recipe)
+        response = self.client().get(self.base_url + 'ingredients?q=cinnamon,+eggs', headers= \
+                dict(Authorization="Bearer " + self.access_token))
+        result = json.loads(response.data.decode())
+        self.assertEqual([recipe['recipe_name'] for recipe in result['results']], \
+                ['Cocoa Pancakes'])
+        response = self.client().get(self.base_url + 'ingredients?q=2+cups', headers= \
+                dict(Authorization="Bearer " + self.access_token))
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_recipes_by_ingredient_phrases(self):
+        """Test API for recipe search matching each comma separated ingredient as a whole"""
+        for recipe_name, ingredients in [('Fried Rice', '2 cups brown rice, 1 egg'), \
+                ('Cinnamon Buns', '1 cup (200 g) packed brown sugar, 2 tsp ground cinnamon')]:
+            self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                    dict(Authorization="Bearer " + self.access_token), data=dict(self.recipe, \
+                    recipe_name=recipe_name, ingredients=ingredients))
+        searches = [('brown+sugar&match=any', ['Cinnamon Buns']),
+                    ('cinnamon,+brown+sugar', ['Cinnamon Buns']),
+                    ('brown', ['Fried Rice', 'Cinnamon Buns']),
+                    ('egg,+brown+sugar&match=any', ['Fried Rice', 'Cinnamon Buns']),
+                    ('white+sugar', [])]
+        for q, names in searches:
+            response = self.client().get(self.base_url + 'ingredients?q=' + q, headers= \
+                    dict(Authorization="Bearer " + self.access_token))
+            result = json.loads(response.data.decode())
+            self.assertEqual([recipe['recipe_name'] for recipe in result['results']], names)
+
+    def test_index_all_ingredients(self):
+        """Test indexing ingredients of recipes saved before the ingredient index"""
+        self.client().post(self.base_url + '{}/'.format(self.category_id), headers= \
+                dict(Authorization="Bearer " + self.access_token), data=self.recipe)
+        with self.app.app_context():
+            RecipeIngredient.query.delete()
+            db.session.commit()
+            self.assertEqual(Recipe.index_all_ingredients(batch_size=1), 1)
+            self.assertEqual(sorted(item.term for item in RecipeIngredient.query), \
+                    ['benedictine', 'cocoa', 'cocoa powder', 'cream', 'cube', 'espresso', \
+                    'heavy', 'heavy cream', 'ice', 'ice cube', 'powder', 'unsweetened', \
+                    'unsweetened cocoa', 'unsweetened cocoa powder'])
+            db.session.delete(Recipe.query.first())
+            db.session.commit()
+            self.assertEqual(RecipeIngredient.query.count(), 0)
+
     def test_search_recipe_invalid_category(self):
         """Test API for recipe search with invalid category id (GET request)"""
         response = self.client().get(self.base_url + '2/search?q={}&page=1t&limit=5y'. \
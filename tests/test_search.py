@@ -0,0 +1,175 @@
+""" Unit tests for fuzzy category and recipe search """
+
+import os
+import tempfile
+import unittest
+import json
+from unittest.mock import patch
+from sqlalchemy.dialects import postgresql
+from app import create_app, db
+from app.v1.models.category_models import Category
+from app.v1.utils.search import fuzzy_search, similarity, trigrams, _score_rows
+
+# pylint: disable=C0103
+
+class TrigramTests(unittest.TestCase):
+    """ Tests for the trigram scorer used where pg_trgm is not installed """
+
+    def test_trigrams(self):
+        """Test trigrams are extracted per word like pg_trgm"""
+        self.assertEqual(trigrams('Cat'), {'  c', ' ca', 'cat', 'at '})
+        self.assertEqual(trigrams('a-B'), {'  a', ' a ', '  b', ' b '})
+        self.assertEqual(trigrams('!!'), set())
+
+    def test_similarity(self):
+        """Test similarity matches pg_trgm scores"""
+        self.assertEqual(similarity('word', 'word'), 1.0)
+        self.assertAlmostEqual(similarity('word', 'two words'), 4 / 11)
+        self.assertAlmostEqual(similarity('Breakfast', 'brekfast'), 7 / 12)
+        self.assertEqual(similarity('', 'word'), 0.0)
+
+class FuzzySearchTests(unittest.TestCase):
+    """ Tests for fuzzy search, run against an SQLite database without pg_trgm """
+
+    def setUp(self):
+        """Define test variables and initialize app"""
+        self.app = create_app(config_name="testing")
+        self.db_fd, self.db_path = tempfile.mkstemp()
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + self.db_path
+        self.client = self.app.test_client
+        register_data = {'username': 'newuser',
+                         'email': 'example@domain.com',
+                         'password': 'Bootcamp17',
+                         'confirm_password': 'Bootcamp17'
+                        }
+        login_data = {'username': 'newuser', 'password': 'Bootcamp17'}
+        with self.app.app_context():
+            db.create_all()
+            self.client().post('/api/v1/auth/register', data=register_data)
+            result = self.client().post('/api/v1/auth/login', data=login_data)
+            self.headers = dict(Authorization="Bearer " + \
+                    json.loads(result.data.decode())['access_token'])
+            for category_name in ['Breakfast', 'Lunch', 'Breakfast Drinks']:
+                result = self.client().post('/api/v1/category/', headers=self.headers, \
+                        data={'category_name': category_name})
+            self.category_id = json.loads(result.data.decode())['id']
+            for recipe_name in ['Espresso Esiri', 'Iced Espresso', 'Orange Juice']:
+                self.client().post('/api/v1/recipe/{}/'.format(self.category_id), \
+                        headers=self.headers, data={'recipe_name': recipe_name, \
+                        'ingredients': 'Coffee', 'directions': 'Brew'})
+
+    def test_fuzzy_search_category(self):
+        """Test API for fuzzy category search with a misspelt name (GET request)"""
+        response = self.client().get('/api/v1/category/search?q=brekfast&mode=fuzzy', \
+                headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data.decode())
+        self.assertEqual([category['category_name'] for category in result['results']], \
+                ['Breakfast', 'Breakfast Drinks'])
+        self.assertNotIn('suggestions', result)
+
+    def test_fuzzy_search_recipe(self):
+        """Test API for fuzzy recipe search with a misspelt name (GET request)"""
+        response = self.client().get('/api/v1/recipe/{}/search?q=expresso&mode=fuzzy'. \
+                format(self.category_id), headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data.decode())
+        self.assertEqual([recipe['recipe_name'] for recipe in result['results']], \
+                ['Espresso Esiri', 'Iced Espresso'])
+
+    def test_fuzzy_search_uses_trigram_operator(self):
+        """Test fuzzy search filters with the pg_trgm % operator"""
+        with self.app.app_context(), patch('app.v1.utils.search.has_pg_trgm', \
+                return_value=True):
+            statement = str(fuzzy_search(Category.query, Category.category_name, \
+                    Category.id, 'brekfast').statement.compile(dialect=postgresql.dialect()))
+        self.assertIn('categories.category_name %% ', statement)
+        self.assertIn('similarity(categories.category_name', statement)
+
+    def test_fuzzy_search_scores_candidates_only(self):
+        """Test only rows sharing part of a trigram with search term are scored in Python"""
+        with self.app.app_context():
+            scored = _score_rows(Category.query, Category.category_name, Category.id, \
+                    'brekfast')
+        self.assertEqual([value for _, _, value in scored], ['Breakfast', 'Breakfast Drinks'])
+
+    def test_search_suggestions(self):
+        """Test API for suggestions when a search finds nothing (GET request)"""
+        response = self.client().get('/api/v1/category/search?q=brekfast', \
+                headers=self.headers)
+        result = json.loads(response.data.decode())
+        self.assertEqual(result['results'], [])
+        self.assertEqual(result['suggestions'], ['Breakfast', 'Breakfast Drinks'])
+        response = self.client().get('/api/v1/recipe/{}/search?q=orang+jus'. \
+                format(self.category_id), headers=self.headers)
+        result = json.loads(response.data.decode())
+        self.assertEqual(result['results'], [])
+        self.assertEqual(result['suggestions'], ['Orange Juice'])
+
+    def tearDown(self):
+        """Teardown initialized variables"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.get_engine(self.app).dispose()
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+class PgTrgmSearchTests(unittest.TestCase):
+    """ Tests for fuzzy search with pg_trgm, run against PostgreSQL where it is available """
+
+    def setUp(self):
+        """Define test variables and initialize app"""
+        self.app = create_app(config_name="testing")
+        self.client = self.app.test_client
+        with self.app.app_context():
+            available, installed = db.session.execute("SELECT name IS NOT NULL, \
+                    installed_version IS NOT NULL FROM pg_available_extensions WHERE name = \
+                    'pg_trgm'").first() or (False, False)
+            if not available:
+                self.skipTest('pg_trgm is not available')
+            # Other tests expect the fallback scoring, so the extension is only kept if it
+            # was installed before
+            self.created_extension = not installed
+            if self.created_extension:
+                db.session.execute('CREATE EXTENSION pg_trgm')
+                db.session.commit()
+            db.create_all()
+            self.client().post('/api/v1/auth/register', data={'username': 'newuser', \
+                    'email': 'example@domain.com', 'password': 'Bootcamp17', \
+                    'confirm_password': 'Bootcamp17'})
+            result = self.client().post('/api/v1/auth/login', \
+                    data={'username': 'newuser', 'password': 'Bootcamp17'})
+            self.headers = dict(Authorization="Bearer " + \
+                    json.loads(result.data.decode())['access_token'])
+            for category_name in ['Breakfast', 'Lunch', 'Breakfast Drinks']:
+                self.client().post('/api/v1/category/', headers=self.headers, \
+                        data={'category_name': category_name})
+
+    def test_fuzzy_search_category(self):
+        """Test API for fuzzy category search with pg_trgm (GET request)"""
+        response = self.client().get('/api/v1/category/search?q=brekfast&mode=fuzzy', \
+                headers=self.headers)
+        result = json.loads(response.data.decode())
+        self.assertEqual([category['category_name'] for category in result['results']], \
+                ['Breakfast', 'Breakfast Drinks'])
+
+    def test_search_suggestions(self):
+        """Test API for suggestions with pg_trgm when a search finds nothing (GET request)"""
+        response = self.client().get('/api/v1/category/search?q=brekfast', \
+                headers=self.headers)
+        result = json.loads(response.data.decode())
+        self.assertEqual(result['results'], [])
+        self.assertEqual(result['suggestions'], ['Breakfast', 'Breakfast Drinks'])
+
+    def tearDown(self):
+        """Teardown initialized variables"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            if self.created_extension:
+                db.session.execute('DROP EXTENSION pg_trgm')
+                db.session.commit()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+""" Unit tests for the shared category and recipe serializers """
+
+import json
+import unittest
+from collections import namedtuple
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from flask import jsonify
+from werkzeug.http import http_date as werkzeug_http_date
+from app import create_app
+from app.v1.utils import serializers
+
+# pylint: disable=C0103
+
+Row = namedtuple('Row', ['id', 'recipe_name', 'date_modified'])
+
+class SerializerTests(unittest.TestCase):
+    """ Tests for serialization of rows to JSON """
+
+    def setUp(self):
+        """Define test variables and initialize app"""
+        self.app = create_app(config_name="testing")
+        self.data = {'results': [{'id': 1, 'recipe_name': 'Espresso Esiri', \
+                'date_modified': datetime(2018, 1, 9, 7, 5, 3, 123456)}], 'next_link': ''}
+
+    def test_http_date(self):
+        """Test dates are formatted as by Flask's JSON encoder"""
+        value = datetime(2017, 12, 31, 23, 59, 59)
+        for _ in range(400):
+            self.assertEqual(serializers.http_date(value), werkzeug_http_date(value.timetuple()))
+            value += timedelta(days=1, hours=5, minutes=7, seconds=11)
+        self.assertIsNone(serializers.http_date(None))
+
+    def test_serialize_projected_row(self):
+        """Test projected tuples are serialized like model instances"""
+        row = Row(2, 'Iced Espresso', datetime(2018, 1, 9, 7, 5, 3))
+        self.assertEqual(serializers.serialize(row, ['id', 'date_modified']), \
+                {'id': 2, 'date_modified': 'Tue, 09 Jan 2018 07:05:03 GMT'})
+
+    def test_json_response(self):
+        """Test JSON responses match jsonify with and without orjson"""
+        with self.app.test_request_context():
+            expected = json.loads(jsonify(self.data).get_data(as_text=True))
+            for orjson in [serializers.orjson, None]:
+                with patch.object(serializers, 'orjson', orjson):
+                    response = serializers.json_response(self.data, 201)
+                    self.assertEqual(response.status_code, 201)
+                    self.assertEqual(response.mimetype, 'application/json')
+                    self.assertEqual(json.loads(response.get_data(as_text=True)), expected)
+                    self.assertEqual(json.loads(serializers.dumps(self.data).decode()), \
+                            expected)
+                    self.assertNotIn(b'\n', serializers.dumps(self.data))
+
+if __name__ == "__main__":
+    unittest.main()